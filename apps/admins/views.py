@@ -2,6 +2,7 @@ import os
 import time
 import requests
 from datetime import datetime, timedelta
+from functools import partial
 from threading import Thread
 
 from django.conf import settings
@@ -18,7 +19,6 @@ from rest_framework import filters, permissions, status, viewsets, generics
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.throttling import UserRateThrottle
 
 from apps.admins.models import AdminActionLog
 from apps.admins.serializers import (
@@ -38,15 +38,16 @@ from apps.admins.serializers import (
     NotificationAdminSerializer, AdminTaskAssignmentSerializer,
 )
 from apps.notifications.models import Notification
+from apps.notifications.utils import get_content_type_id
 from apps.projects.models import Project, ProjectMembership, ProjectInvitation
 from apps.projects.views import InvitationEmailMixin
 from apps.subscriptions.models import Payment, Subscription, SubscriptionPlan
 from apps.tasks.models import (Comment, StatusChangeRequest, Task,
                                 TaskAssignment)
 from core.permissions import IsAdminUser
-from core.tasks import send_email, send_real_time_notification
-if settings.DEBUG:
-    from project_planner.logging import DEBUG, ERROR, INFO, project_logger
+from core.throttling import FastUserRateThrottle
+from core.tasks import send_email, send_real_time_notification_batch_task
+from project_planner.logging import DEBUG, ERROR, INFO, project_logger
 
 User = get_user_model()
 
@@ -54,7 +55,7 @@ User = get_user_model()
 class AdminViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [FastUserRateThrottle]
     json_encoder = DjangoJSONEncoder
     def perform_create(self, serializer):
         instance = serializer.save()
@@ -148,7 +149,7 @@ class UserAdminViewSet(AdminViewSet):
     filterset_fields = ['is_active', 'role', 'email_verified']
     search_fields = ['username', 'email']
     ordering_fields = ['date_joined', 'last_login']
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [FastUserRateThrottle]
 
     def get_serializer_class(self):
         """
@@ -1096,18 +1097,18 @@ class NotificationAdminViewSet(viewsets.ModelViewSet):
         if not users.exists():
             return Response({'error': 'No recipients found'}, status=status.HTTP_400_BAD_REQUEST)
 
-        for user in users:
-            send_real_time_notification.delay(
-                user=user,
-                message={
-                    "title": title,
-                    "body": body,
-                    "url": url,
-                },
-                notification_type="admin_notification",
-                content_type=ContentType.objects.get_for_model(User).id,
-                object_id=user.id
-            )
+        user_content_type_id = get_content_type_id(User)
+        message = {
+            "title": title,
+            "body": body,
+            "url": url,
+        }
+        # One batched task instead of a synchronous save and push per user
+        entries = [
+            (user_id, message, "admin_notification", user_content_type_id, user_id)
+            for user_id in users.values_list('id', flat=True)
+        ]
+        transaction.on_commit(partial(send_real_time_notification_batch_task.delay, entries))
 
         self.log_admin_action('send_notification', None, {'user_ids': user_ids, 'title': title})
         return Response({'status': 'notifications sent'})
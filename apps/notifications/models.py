@@ -82,7 +82,7 @@ class Notification(models.Model):
         """
         Retry sending a failed notification.
         """
-        from notifications.utils import send_real_time_notification
+        from apps.notifications.utils import send_real_time_notification
 
         if self.retry_count >= RETRY_LIMIT:
             self.status = 'failed'
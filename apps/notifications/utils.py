@@ -1,8 +1,20 @@
+import asyncio
+from functools import lru_cache
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
+from django.contrib.contenttypes.models import ContentType
 from apps.notifications.models import Notification
 
 RETRY_DELAY = 60  # seconds
+
+
+@lru_cache(maxsize=None)
+def get_content_type_id(model):
+    """
+    Returns the ContentType id for a model, resolved once per process.
+    """
+    return ContentType.objects.get_for_model(model).id
+
 def send_real_time_notification(user, message, notification_type, content_type, object_id):
     """
     Sends a real-time WebSocket notification and saves it to the database.
@@ -36,4 +48,71 @@ def send_real_time_notification(user, message, notification_type, content_type,
         from core.tasks import retry_failed_notifications
         retry_failed_notifications.apply_async((notification.id,), countdown=RETRY_DELAY)
     finally:
-        notification.save()
\ No newline at end of file
+        notification.save()
+
+
+def _notification_event(message):
+    return {
+        'type': 'send_notification',
+        'data': {
+            'title': message['title'],
+            'body': message['body'],
+            'url': message.get('url'),
+        }
+    }
+
+
+async def _group_send_all(channel_layer, targets):
+    return await asyncio.gather(
+        *(channel_layer.group_send(f'user_{user_id}', event) for user_id, event in targets),
+        return_exceptions=True
+    )
+
+
+def send_real_time_notifications(user_ids, message, notification_type, content_type, object_id):
+    """
+    Sends the same real-time WebSocket notification to several users.
+    All rows are saved with one INSERT and the pushes share one event loop hop.
+    """
+    send_real_time_notification_batch([
+        (user_id, message, notification_type, content_type, object_id)
+        for user_id in user_ids
+    ])
+
+
+def send_real_time_notification_batch(entries, batch_size=500):
+    """
+    Sends a batch of possibly different real-time WebSocket notifications.
+    Each entry is a (user_id, message, notification_type, content_type, object_id) tuple.
+    Rows are saved with batched INSERTs and every push shares one event loop hop.
+    """
+    notifications = Notification.objects.bulk_create([
+        Notification(
+            recipient_id=user_id,
+            message=message['body'],
+            notification_type=notification_type,
+            content_type_id=content_type,
+            object_id=object_id,
+            status="pending"
+        )
+        for user_id, message, notification_type, content_type, object_id in entries
+    ], batch_size=batch_size)
+
+    targets = [
+        (notification.recipient_id, _notification_event(entry[1]))
+        for notification, entry in zip(notifications, entries)
+    ]
+    try:
+        results = async_to_sync(_group_send_all)(get_channel_layer(), targets)
+    except Exception as exc:
+        results = [exc] * len(notifications)
+
+    delivered_ids = [n.id for n, result in zip(notifications, results) if not isinstance(result, Exception)]
+    failed_ids = [n.id for n, result in zip(notifications, results) if isinstance(result, Exception)]
+    if delivered_ids:
+        Notification.objects.filter(id__in=delivered_ids).update(status='delivered')
+    if failed_ids:
+        Notification.objects.filter(id__in=failed_ids).update(status='failed')
+        from core.tasks import retry_failed_notifications
+        for notification_id in failed_ids:
+            retry_failed_notifications.apply_async((notification_id,), countdown=RETRY_DELAY)
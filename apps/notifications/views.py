@@ -6,6 +6,7 @@ from apps.notifications.serializers import (
     NotificationPreferenceSerializer
 )
 from apps.notifications.filters import NotificationFilter
+from project_planner.pagination import CreatedAtCursorPagination
 # third-party imports
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
@@ -22,8 +23,10 @@ class NotificationListView(generics.ListAPIView):
     serializer_class = NotificationListSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = NotificationFilter
-    ordering_fields = ['created_at', 'priority']
+    # Cursor pagination needs a stable, non-null ordering key, so priority isn't offered
+    ordering_fields = ['created_at']
     ordering = ['-created_at']
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         """
@@ -37,7 +40,7 @@ class NotificationListView(generics.ListAPIView):
             OpenApiParameter(name='is_read', type=bool, description='Filter by read status'),
             OpenApiParameter(name='notification_type', type=str, description='Filter by notification type'),
             OpenApiParameter(name='priority', type=str, description='Filter by priority'),
-            OpenApiParameter(name='ordering', type=str, description='Order by field (e.g. created_at, -priority)'),
+            OpenApiParameter(name='ordering', type=str, description='created_at or -created_at; defaults to -created_at'),
         ],
         responses={
             200: NotificationListSerializer(many=True),
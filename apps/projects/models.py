@@ -39,6 +39,17 @@ class Project(models.Model):
     due_date = models.DateTimeField(null=True, blank=True)  # Optional due date for the project
     total_member_count = models.PositiveIntegerField(default=1)  # Total members in the project (including the owner)
     admin_override = models.BooleanField(default=False)  # Flag to check admin override of project details (e.g., increase member count)
+
+    class Meta:
+        indexes = [
+            # Covers only active projects, which is all check_overdue_items scans for
+            models.Index(
+                fields=['due_date'],
+                condition=models.Q(status__in=['not_started', 'in_progress']),
+                name='idx_project_due_active',
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -6,12 +6,12 @@ from apps.projects.serializers import (
     ProjectInvitationSerializer, ProjectInvitationAcceptSerializer
 )
 from apps.projects.filters import ProjectFilter
-from apps.notifications.utils import send_real_time_notification
+from apps.notifications.utils import send_real_time_notification, get_content_type_id
 from core.permissions import IsProjectMember,IsProjectOwner
 from core.services.mail_service import EmailService
+from project_planner.pagination import CreatedAtCursorPagination
 
 # django imports
-from django.contrib.contenttypes.models import ContentType
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -68,7 +68,7 @@ class InvitationEmailMixin:
             OpenApiParameter(name='status', description='Filter projects by status', type=str),
             OpenApiParameter(name='due_date', description='Filter projects by due date', type=str),
             OpenApiParameter(name='search', description='Search projects by name or description', type=str),
-            OpenApiParameter(name='ordering', description='Order projects by field (e.g. name, -created_at)', type=str),
+            OpenApiParameter(name='ordering', description='created_at or -created_at; defaults to -created_at', type=str),
         ],
         responses={
             200: ProjectListSerializer(many=True),  # Response for successful retrieval
@@ -108,8 +108,9 @@ class ProjectListCreateView(generics.ListCreateAPIView):
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_class = ProjectFilter  # Custom filter class
     search_fields = ['name', 'description']  # Fields to search
-    ordering_fields = ['name', 'created_at', 'due_date', 'status']  # Fields to order
+    ordering_fields = ['created_at']  # Cursor pagination needs a stable, non-null ordering key
     ordering = ['-created_at']  # Default ordering
+    pagination_class = CreatedAtCursorPagination  # Keyset pages, no COUNT(*)
 
     def get_serializer_class(self):
         # Determine serializer based on HTTP method
@@ -167,6 +168,9 @@ class ProjectListCreateView(generics.ListCreateAPIView):
 
         members = serializer.validated_data.get('members', [])  # Get project members
         request = self.request
+        # Resolved once for every member notified below
+        project_url = request.build_absolute_uri(reverse('project-retrieve-update-destroy', kwargs={'pk': project.id}))
+        project_content_type_id = get_content_type_id(Project)
         # Notify members about their assignment to the project
         for member in members:
             send_real_time_notification(
@@ -174,10 +178,10 @@ class ProjectListCreateView(generics.ListCreateAPIView):
                 message={
                     "title": "New Project Assigned",
                     "body": f"You have been added to the project '{project.name}'.",
-                    "url": request.build_absolute_uri(reverse('project-retrieve-update-destroy', kwargs={'pk': project.id}))
+                    "url": project_url
                 },
                 notification_type="project",  # Notification type
-                content_type=ContentType.objects.get_for_model(Project).id,  # Reference model
+                content_type=project_content_type_id,  # Reference model
                 object_id=project.id  # Reference project
             )
 
@@ -361,34 +365,37 @@ class ProjectRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         new_members = serializer.context.get('new_members', [])
         removed_members = serializer.context.get('removed_members', [])
         request = self.request
+        project_content_type_id = get_content_type_id(Project)
 
         # Send notifications to newly added members.
         if new_members:
+            project_url = request.build_absolute_uri(reverse('project-retrieve-update-destroy', kwargs={'pk': updated_project.id}))
             for member in new_members:
                 send_real_time_notification(
                     user=member,
                     message={
                         "title": "New Project Assigned",
                         "body": f"You have been added to the project '{updated_project.name}'.",
-                        "url": request.build_absolute_uri(reverse('project-retrieve-update-destroy', kwargs={'pk': updated_project.id}))
+                        "url": project_url
                     },
                     notification_type="project",
-                    content_type=ContentType.objects.get_for_model(Project).id,
+                    content_type=project_content_type_id,
                     object_id=updated_project.id
                 )
 
         # Notify removed members about their removal.
         if removed_members:
+            project_list_url = request.build_absolute_uri(reverse('project-list-create'))
             for member in removed_members:
                 send_real_time_notification(
                     user=member,
                     message={
                         "title": "Project Removed",
                         "body": f"You have been removed from the project '{updated_project.name}'.",
-                        "url": request.build_absolute_uri(reverse('project-list-create'))
+                        "url": project_list_url
                     },
                     notification_type="project",
-                    content_type=ContentType.objects.get_for_model(Project).id,
+                    content_type=project_content_type_id,
                     object_id=updated_project.id
                 )
 
@@ -1,6 +1,35 @@
 from rest_framework import filters
 from django.db.models import Q
-from .models import Task, Project
+from django_filters.rest_framework import FilterSet
+from .models import Task, Project, Comment
+
+
+# Explicit FilterSet classes are built once at import, rather than generated
+# from a view's filterset_fields by DjangoFilterBackend on each request.
+class TaskFilterSet(FilterSet):
+    class Meta:
+        model = Task
+        fields = {
+            'status': ['exact'],
+            'due_date': ['exact', 'gte', 'lte'],
+            'assigned_by': ['exact'],
+            'project': ['exact'],
+            'need_approval': ['exact'],
+            'created_at': ['gte', 'lte'],
+        }
+
+
+class TaskDetailFilterSet(FilterSet):
+    class Meta:
+        model = Task
+        fields = ['status', 'due_date', 'assigned_by', 'project']
+
+
+class CommentFilterSet(FilterSet):
+    class Meta:
+        model = Comment
+        fields = ['task']
+
 
 class PermissionBasedFilterBackend(filters.BaseFilterBackend):
     """
@@ -3,12 +3,15 @@ from django.utils import timezone
 from django.db import models
 from django.contrib.auth import get_user_model
 from apps.projects.models import Project
-from django.db.models import F
+from django.db.models import F, Q, ExpressionWrapper
 from markdown import markdown
 from bleach import Cleaner
 from bleach.linkifier import LinkifyFilter
 User = get_user_model()
 
+# An @ at the start of a whitespace-separated word, followed by the username
+MENTION_PATTERN = re.compile(r'(?<!\S)@(\S+)')
+
 class Task(models.Model):
     STATUS_CHOICES = (
         ("not_started", "Not Started"),
@@ -45,6 +48,12 @@ class Task(models.Model):
         indexes = [  # Indexes for optimizing frequent queries
             models.Index(fields=["due_date"]),
             models.Index(fields=["status"]),
+            models.Index(fields=["-created_at", "-id"]),  # Cursor pagination on the task list
+            models.Index(  # Active tasks only, for the due-date scan in check_overdue_items
+                fields=["due_date"],
+                condition=models.Q(status__in=["not_started", "in_progress"]),
+                name="idx_task_due_active",
+            ),
         ]
 
     def __str__(self):
@@ -74,6 +83,32 @@ class TaskAssignment(models.Model):
 # Comment Features #
 # =================#
 
+class CommentQuerySet(models.QuerySet):
+    """
+    Custom QuerySet for Comment to compute derived flags in the database.
+    """
+
+    def with_has_replies(self):
+        """
+        Annotates each comment with a has_replies flag derived from reply_count.
+        """
+        return self.annotate(
+            has_replies=ExpressionWrapper(Q(reply_count__gt=0), output_field=models.BooleanField())
+        )
+
+
+class CommentManager(models.Manager):
+    """
+    Custom Manager for Comment exposing the CommentQuerySet helpers.
+    """
+
+    def get_queryset(self):
+        return CommentQuerySet(self.model, using=self._db)
+
+    def with_has_replies(self):
+        return self.get_queryset().with_has_replies()
+
+
 class Comment(models.Model):
     task = models.ForeignKey('Task', on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_comments')
@@ -84,6 +119,8 @@ class Comment(models.Model):
     parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='replies')
     reply_count = models.PositiveIntegerField(default=0)
     mention_count = models.PositiveIntegerField(default=0)
+    # Custom manager
+    objects = CommentManager()
 
     # Markdown and XSS protection settings
     ALLOWED_TAGS = [
@@ -109,6 +146,7 @@ class Comment(models.Model):
             models.Index(fields=['task']),
             models.Index(fields=['author']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['-created_at', '-id']),  # Cursor pagination on the comment list
         ]
 
     def __str__(self):
@@ -134,19 +172,22 @@ class Comment(models.Model):
     def save(self, *args, **kwargs):
         is_new = self.pk is None
         super().save(*args, **kwargs)
-        if is_new:
+        update_fields = kwargs.get('update_fields')
+        if is_new or update_fields is None or 'content' in update_fields:
             self.process_mentions()
-            if self.parent:
-                Comment.objects.filter(pk=self.parent.pk).update(reply_count=F('reply_count') + 1)
+        if is_new and self.parent:
+            Comment.objects.filter(pk=self.parent.pk).update(reply_count=F('reply_count') + 1)
 
     def process_mentions(self):
-        mentioned_usernames = {
-            word[1:] for word in self.content.split() if word.startswith('@') and len(word) > 1
-        }
-        if mentioned_usernames:
-            mentioned_users = User.objects.filter(username__in=mentioned_usernames)
-            self.mentioned_users.set(mentioned_users)
-            self.mention_count = mentioned_users.count()
+        mentioned_usernames = set(MENTION_PATTERN.findall(self.content))
+        # One query resolves every mention; the count comes from the same result
+        mentioned_user_ids = list(
+            User.objects.filter(username__in=mentioned_usernames).values_list('id', flat=True)
+        ) if mentioned_usernames else []
+        # Edits can drop every mention, so stale ones are cleared as well
+        if mentioned_user_ids or self.mention_count:
+            self.mentioned_users.set(mentioned_user_ids)
+            self.mention_count = len(mentioned_user_ids)
             self.save(update_fields=['mention_count'])
 
     def delete(self, *args, **kwargs):
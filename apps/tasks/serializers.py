@@ -4,18 +4,65 @@ from apps.projects.models import Project, ProjectMembership
 from apps.projects.serializers import ProjectMembershipSerializer
 from apps.tasks.models import Task, TaskAssignment, Comment, StatusChangeRequest
 from apps.users.serializers import CustomUserSerializer, DetailedUserSerializer
+from core.serializers import CachedFieldsMixin
 # django imports
 from django.contrib.auth import get_user_model
 from django.utils  import timezone
 from django.urls import reverse
 from django.db import transaction
+from django.db.models import Prefetch, Exists, OuterRef
 # third-party imports
 from rest_framework import serializers
 from rest_framework.generics import ListCreateAPIView
 from rest_framework.exceptions import ValidationError
 User = get_user_model()
 
-class TaskAssignmentSerializer(serializers.ModelSerializer):
+# Statuses an assignee may set directly on a task that doesn't need approval
+VALID_STATUS_CHANGES = frozenset(('completed',))
+# Task statuses from which a status change request may be raised
+REQUESTABLE_TASK_STATUSES = frozenset(('in_progress', 'overdue'))
+# Project statuses in which comments can't be added or edited
+COMMENT_LOCKED_PROJECT_STATUSES = frozenset(('completed', 'not_started', 'on_hold'))
+
+# Narrow prefetch used wherever only the assignee ids of a task are needed
+ASSIGNEE_IDS_PREFETCH = Prefetch(
+    'assignments', queryset=TaskAssignment.objects.only('id', 'task_id', 'user_id')
+)
+
+# Narrow prefetch with just the columns TaskAssignmentSerializer renders
+TASK_ASSIGNMENTS_PREFETCH = Prefetch(
+    'assignments',
+    queryset=TaskAssignment.objects.only('id', 'task_id', 'user_id', 'assigned_at')
+)
+
+
+def get_assignee_ids(task):
+    """
+    Return the set of user ids assigned to the task.
+    The set is cached on the instance and built from prefetched assignments when available.
+    """
+    assignee_ids = getattr(task, '_assignee_ids', None)
+    if assignee_ids is None:
+        assignee_ids = {assignment.user_id for assignment in task.assignments.all()}
+        task._assignee_ids = assignee_ids
+    return assignee_ids
+
+
+def get_membership_map(context, project):
+    """
+    Return the user_id -> membership id map for the project.
+    The map is built once per serializer context and shared by nested serializers.
+    """
+    membership_map = context.setdefault('membership_map', {})
+    if project.id not in membership_map:
+        # Iterating .all() reuses prefetched memberships when the caller loaded them
+        membership_map[project.id] = {
+            membership.user_id: membership.id for membership in project.memberships.all()
+        }
+    return membership_map[project.id]
+
+
+class TaskAssignmentSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Optimized serializer for task assignment details.
     """
@@ -32,27 +79,42 @@ class TaskAssignmentSerializer(serializers.ModelSerializer):
         """
         request = self.context.get('request')
         if not request:
-            print("Request not found in context.")  # Debugging
             return None
 
-        # Directly get the URL for the membership if available
-        membership_url = None
-        try:
-            membership = ProjectMembership.objects.get(
-                project=obj.task.project,
-                user=obj.user
-            )
-            membership_url = request.build_absolute_uri(reverse(
-                'project-membership-detail', kwargs={'id': membership.id}
-            ))
-        except ProjectMembership.DoesNotExist:
-            print("ProjectMembership does not exist.")  # Debugging
+        # Use the membership map built by the parent serializer when available
+        membership_map = self.context.get('membership_map', {}).get(obj.task.project_id)
+        if membership_map is not None:
+            membership_id = membership_map.get(obj.user_id)
+        else:
+            membership_id = ProjectMembership.objects.filter(
+                project_id=obj.task.project_id,
+                user_id=obj.user_id
+            ).values_list('id', flat=True).first()
+
+        if membership_id is None:
+            return None
 
-        return membership_url
+        return request.build_absolute_uri(reverse(
+            'project-membership-detail', kwargs={'id': membership_id}
+        ))
 
 
 
-class TaskListSerializer(serializers.ModelSerializer):
+class ProjectWithMembershipField(serializers.PrimaryKeyRelatedField):
+    """
+    Project PK field that annotates the fetched project with whether the requesting
+    user is a member, so permission checks don't need a separate query.
+    """
+    def get_queryset(self):
+        user = self.context['request'].user
+        return Project.objects.annotate(
+            user_is_member=Exists(
+                ProjectMembership.objects.filter(project=OuterRef('pk'), user=user)
+            )
+        )
+
+
+class TaskListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for listing tasks with minimal information.
     """
@@ -60,7 +122,7 @@ class TaskListSerializer(serializers.ModelSerializer):
         model = Task
         fields = ['id', 'name', 'due_date', 'status']
         
-class TaskDetailSerializer(serializers.ModelSerializer):
+class TaskDetailSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for showing detailed information about a task.
     """
@@ -78,11 +140,16 @@ class TaskDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'approved_by', 'assigned_by']
 
-class TaskCreateSerializer(serializers.ModelSerializer):
+    def to_representation(self, instance):
+        # Build the membership lookup once so nested assignments don't query per row
+        get_membership_map(self.context, instance.project)
+        return super().to_representation(instance)
+
+class TaskCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for creating a new task with optional assignees.
     """
-    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())
+    project = ProjectWithMembershipField()
     assigned_by = serializers.HiddenField(default=serializers.CurrentUserDefault())  # Automatically assign the user creating the task
     assignees = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), many=True, required=False)  # List of assignees for the task
     due_date = serializers.DateTimeField(required=False)
@@ -110,10 +177,12 @@ class TaskCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Project does not exist.")
 
         # Check membership directly through ProjectMembership model
-        project_members = project.memberships.values_list('user', flat=True)
-        for assignee in value:
-            if assignee.id not in project_members:
-                raise serializers.ValidationError(f"User {assignee} is not a member of the project.")
+        project_members = set(project.memberships.values_list('user_id', flat=True))
+        missing = [assignee for assignee in value if assignee.id not in project_members]
+        if missing:
+            raise serializers.ValidationError(
+                f"Users not in project: {[user.id for user in missing]}"
+            )
         return value
 
 
@@ -122,23 +191,24 @@ class TaskCreateSerializer(serializers.ModelSerializer):
         Create a new task, assign members (including project owner if not already in assignees), and update total_assignees.
         """
         assignees = validated_data.pop('assignees', [])
-        task = Task.objects.create(**validated_data)
-
-        # Bulk create assignments
-        TaskAssignment.objects.bulk_create([
-            TaskAssignment(task=task, user=user)
-            for user in assignees
-        ])
-
-        # Update total_assignees count
-        task.total_assignees = len(assignees)
-        task.save(update_fields=['total_assignees'])
+        # One transaction: the task-count recompute queued by the Task post_save signal runs
+        # on commit, after the assignments exist, and a failed insert leaves no orphan task
+        with transaction.atomic():
+            # Set total_assignees on insert instead of issuing a second UPDATE
+            task = Task.objects.create(**validated_data, total_assignees=len(assignees))
+
+            # Bulk create assignments
+            TaskAssignment.objects.bulk_create([
+                TaskAssignment(task=task, user=user)
+                for user in assignees
+            ])
         return task
 
     def to_representation(self, instance):
         """
         Customize the response to show assignees and total_assignees.
         """
+        get_membership_map(self.context, instance.project)
         return {
             'id': instance.id,
             'name': instance.name,
@@ -155,7 +225,7 @@ class TaskCreateSerializer(serializers.ModelSerializer):
             ).data,
         }
     
-class TaskUpdateSerializer(serializers.ModelSerializer):
+class TaskUpdateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for updating task details, including managing assignees.
     """
@@ -179,43 +249,48 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
         Partially update task fields and manage assignees with optimized database queries.
         """
         assignees = validated_data.pop('assignees', None)
-        new_assignees = []
-        removed_assignees = []
         # Update task fields
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        print(instance.status)
-        if assignees is not None:
-            # Get the current assignees (users already assigned to the task)
-            current_assignees = set(instance.assignments.values_list('user', flat=True))
-            new_assignees_set = set(assignee.id for assignee in assignees)
-
-
-            to_remove = current_assignees - new_assignees_set
-            to_add = new_assignees_set - current_assignees
-            
-            if to_remove:
-                # Remove assignees
-                TaskAssignment.objects.filter(task=instance, user__in=to_remove).delete()
-                to_remove = list(to_remove)
-                
-            if to_add:
-                for user_id in to_add:
-                    TaskAssignment.objects.create(task=instance, user_id=user_id)
-                to_add = list(to_add)
-            
-
-            # Update total_assignees count
-            instance.total_assignees = len(assignees)
-
-            # Save the task instance
-            instance.save()
-
-            self.context['new_assignees'] = User.objects.filter(id__in=to_add)
-            self.context['removed_assignees'] = User.objects.filter(id__in=to_remove)
-        instance.save()
-        instance.refresh_from_db()
-        return instance
+        needs_save = bool(validated_data)
+
+        with transaction.atomic():
+            if assignees is not None:
+                # Get the current assignees (users already assigned to the task)
+                current_assignees = set(instance.assignments.values_list('user', flat=True))
+                new_assignees_set = set(assignee.id for assignee in assignees)
+
+                to_remove = current_assignees - new_assignees_set
+                to_add = new_assignees_set - current_assignees
+
+                # Skip all assignment writes when the assignee set is unchanged
+                if to_remove or to_add:
+                    if to_remove:
+                        # Remove assignees
+                        TaskAssignment.objects.filter(task=instance, user__in=to_remove).delete()
+
+                    if to_add:
+                        # Single INSERT; ignoring conflicts keeps it idempotent under concurrent updates
+                        TaskAssignment.objects.bulk_create(
+                            [TaskAssignment(task=instance, user_id=user_id) for user_id in to_add],
+                            ignore_conflicts=True
+                        )
+
+                    # Update total_assignees count
+                    instance.total_assignees = len(new_assignees_set)
+                    needs_save = True
+
+                    self.context['new_assignees'] = User.objects.filter(id__in=to_add)
+                    self.context['removed_assignees'] = User.objects.filter(id__in=to_remove)
+
+            if needs_save:
+                instance.save()
+
+        # Reload with everything TaskDetailSerializer renders so to_representation doesn't query again.
+        # Related users are rendered as primary keys, so their rows are never loaded.
+        return Task.objects.select_related('project').prefetch_related(
+            TASK_ASSIGNMENTS_PREFETCH, 'project__memberships'
+        ).get(pk=instance.pk)
 
     def destroy(self, instance):
         """
@@ -231,7 +306,7 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
         return TaskDetailSerializer(instance, context=self.context).data
     
 # Task status change by assignee
-class TaskStatusChangeSerializer(serializers.ModelSerializer):
+class TaskStatusChangeSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer to handle the task status update. This serializer only validates 
     the status change for tasks that do not require approval.
@@ -244,18 +319,17 @@ class TaskStatusChangeSerializer(serializers.ModelSerializer):
         """
         Validates the status input to ensure it is a valid task status.
         """
-        valid_statuses = ['completed']
-        if value not in valid_statuses:
+        if value not in VALID_STATUS_CHANGES:
             raise serializers.ValidationError("Invalid status value.")
         return value
 #==================#
 # Comment Features #
 #==================#
 
-class CommentListSerializer(serializers.ModelSerializer):
+class CommentListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     author = serializers.PrimaryKeyRelatedField(read_only=True)
     task = serializers.SerializerMethodField()
-    has_replies = serializers.SerializerMethodField()  # Flag for replies
+    has_replies = serializers.BooleanField(read_only=True)  # Annotated by Comment.objects.with_has_replies()
 
     class Meta:
         model = Comment
@@ -264,16 +338,13 @@ class CommentListSerializer(serializers.ModelSerializer):
     def get_task(self, obj):
         return {'id': obj.task.id, 'name': obj.task.name}
 
-    def get_has_replies(self, obj):
-        return obj.reply_count > 0
-
 
-class CommentDetailSerializer(serializers.ModelSerializer):
+class CommentDetailSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     author = serializers.PrimaryKeyRelatedField(read_only=True)
     mentioned_users = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
     task = serializers.SerializerMethodField()
     project = serializers.SerializerMethodField()
-    has_replies = serializers.SerializerMethodField()  # Flag for replies
+    has_replies = serializers.BooleanField(read_only=True)  # Annotated by Comment.objects.with_has_replies()
 
     class Meta:
         model = Comment
@@ -291,17 +362,31 @@ class CommentDetailSerializer(serializers.ModelSerializer):
     def get_project(self, obj):
         return {'id': obj.task.project.id, 'name': obj.task.project.name}
 
-    def get_has_replies(self, obj):
-        return obj.reply_count > 0
-
-class CommentCreateSerializer(serializers.ModelSerializer):
+class CommentCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     MAX_DEPTH = 3  # Set the maximum allowed depth for nested comments
+    # Project is loaded with the task so the CommentDetailSerializer response needs no extra lookup
+    task = serializers.PrimaryKeyRelatedField(
+        queryset=Task.objects.select_related('project').prefetch_related(ASSIGNEE_IDS_PREFETCH)
+    )
+    # Load the whole ancestor chain with the parent so the depth check needs no extra queries
+    parent = serializers.PrimaryKeyRelatedField(
+        queryset=Comment.objects.select_related('__'.join(['parent'] * (MAX_DEPTH - 1))),
+        required=False,
+        allow_null=True
+    )
 
     class Meta:
         model = Comment
         fields = ['id', 'task', 'content', 'parent']
         read_only_fields = ['id']
 
+    def validate_task(self, task):
+        # The project is select_related on the field queryset, so this check is free
+        project_status = task.project.status
+        if project_status in COMMENT_LOCKED_PROJECT_STATUSES:
+            raise serializers.ValidationError(f"Cannot add comments when project is {project_status}")
+        return task
+
     def validate(self, attrs):
         user = self.context['request'].user
         task = attrs.get('task')
@@ -310,7 +395,7 @@ class CommentCreateSerializer(serializers.ModelSerializer):
         if not task:
             raise serializers.ValidationError({"task": "Task is required."})
 
-        if not task.assignments.filter(user=user).exists():
+        if user.id not in get_assignee_ids(task):
             raise serializers.ValidationError({"task": "You are not assigned to this task."})
 
         # Validate content length
@@ -321,34 +406,39 @@ class CommentCreateSerializer(serializers.ModelSerializer):
         # Validate parent comment
         parent = attrs.get('parent')
         if parent:
-            if parent.task != task:
+            if parent.task_id != task.id:
                 raise serializers.ValidationError(
                     {"parent": "The parent comment must belong to the same task."}
                 )
 
-            # Check depth limit
-            current_depth = 1
-            while parent:
+            # Check depth limit by walking the select_related ancestor chain
+            current_depth = 2  # The new comment sits one level below its parent
+            ancestor = parent
+            while ancestor.parent_id:
                 current_depth += 1
-                parent = parent.parent
                 if current_depth > self.MAX_DEPTH:
                     raise serializers.ValidationError(
                         {"parent": f"Cannot nest comments more than {self.MAX_DEPTH} levels deep."}
                     )
+                ancestor = ancestor.parent
 
         return attrs
 
     def create(self, validated_data):
         # Set the author of the comment to the current user
         validated_data['author'] = self.context['request'].user
-        return super().create(validated_data)
+        comment = super().create(validated_data)
+        comment.has_replies = False  # A new comment has no replies yet
+        return comment
     def to_representation(self, instance):
+        # The instance already carries the validated task/project and its author,
+        # so render it directly instead of refetching the just-written row
         return CommentDetailSerializer(instance, context=self.context).data
     
 #=========================#
 # Status Changes Requests #
 #=========================#
-class StatusChangeRequestSerializer(serializers.ModelSerializer):
+class StatusChangeRequestSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     task = serializers.SerializerMethodField()
     user = serializers.PrimaryKeyRelatedField(read_only=True)
     approved_by = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -375,12 +465,12 @@ class StatusChangeRequestSerializer(serializers.ModelSerializer):
             task = data.get('task')
         user = self.context['request'].user
 
-        if not task.assignments.filter(user=user).exists():
+        if user.id not in get_assignee_ids(task):
             raise serializers.ValidationError("You must be assigned to the task to request status change")
         if self.instance:
             if self.instance.status != 'pending':
                 raise serializers.ValidationError("Only pending status change requests can be updated.")
-        if task.status not in ['in_progress', 'overdue']:
+        if task.status not in REQUESTABLE_TASK_STATUSES:
             raise serializers.ValidationError("Only tasks that are 'in_progress' or 'overdue' can be marked as completed")
         
         if not task.need_approval:
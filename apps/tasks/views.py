@@ -1,14 +1,19 @@
+import hashlib
+from functools import lru_cache, partial
 from typing import Any
 
 # Local imports
 from apps.projects.models import Project, ProjectMembership
 from apps.tasks.models import Task, TaskAssignment, Comment, StatusChangeRequest
-from apps.tasks.filters import PermissionBasedFilterBackend
+from apps.tasks.filters import (
+    PermissionBasedFilterBackend, TaskFilterSet, TaskDetailFilterSet, CommentFilterSet
+)
 from apps.tasks.serializers import (
     TaskCreateSerializer, TaskListSerializer, TaskDetailSerializer,
     TaskUpdateSerializer, StatusChangeRequestSerializer,CommentCreateSerializer,
     CommentListSerializer, CommentDetailSerializer, TaskStatusChangeSerializer,
-    StatusChangeActionSerializer
+    StatusChangeActionSerializer, ASSIGNEE_IDS_PREFETCH, TASK_ASSIGNMENTS_PREFETCH,
+    COMMENT_LOCKED_PROJECT_STATUSES, get_assignee_ids
 )
 from core.permissions import (
     IsProjectOwner,
@@ -17,11 +22,17 @@ from core.permissions import (
     CanManageTask,
     ReadOnly
 )
-from apps.notifications.utils import send_real_time_notification
+from apps.notifications.utils import get_content_type_id
+from core.tasks import send_real_time_notifications_bulk
+from core.throttling import FastUserRateThrottle
+from project_planner.pagination import CreatedAtCursorPagination
 # Django imports
-from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q, Prefetch
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
 # Third-party imports
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import (
@@ -30,11 +41,54 @@ from drf_spectacular.utils import (
 from rest_framework import status, filters, permissions
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView, ListAPIView
+from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView, ListAPIView, get_object_or_404
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.pagination import PageNumberPagination
-from rest_framework.throttling import UserRateThrottle
+
+User = get_user_model()
+
+# Columns rendered by CommentListSerializer, used to narrow comment list queries
+COMMENT_LIST_FIELDS = (
+    'id', 'content', 'created_at', 'reply_count', 'author', 'task', 'task__name'
+)
+# Project statuses in which status change requests can't be created or edited
+STATUS_REQUEST_LOCKED_PROJECT_STATUSES = frozenset(('completed', 'on_hold'))
+
+
+@lru_cache(maxsize=None)
+def cached_reverse(url_name: str) -> str:
+    """
+    Reverse a URL name once and reuse the path on later calls.
+    """
+    return reverse(url_name)
+
+
+@lru_cache(maxsize=None)
+def _pk_url_template(url_name: str) -> str:
+    prefix, suffix = reverse(url_name, kwargs={'pk': 0}).rsplit('/0/', 1)
+    return f"{prefix}/{{pk}}/{suffix}"
+
+
+def reverse_pk(url_name: str, pk: int) -> str:
+    """
+    Build the path of a <int:pk> route from a template resolved once per URL name,
+    instead of running the URL resolver on every notification.
+    """
+    return _pk_url_template(url_name).format(pk=pk)
+
+
+def absolute_url(request, path: str) -> str:
+    """
+    Join a path onto the request's scheme and host. The host is validated and
+    resolved once per request rather than on every build_absolute_uri call.
+    """
+    origin = getattr(request, '_absolute_url_origin', None)
+    if origin is None:
+        origin = request._absolute_url_origin = request.build_absolute_uri('/')[:-1]
+    return origin + path
+
+
 # Utility for standardized responses
 def standardized_response(
     status_code: int,status_message: str,
@@ -61,21 +115,16 @@ class TaskListCreateView(ListCreateAPIView):
     View to list all tasks or create a new task with assignees.
     """
     permission_classes = [IsAuthenticated, IsProjectMember | CanManageTask]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [FastUserRateThrottle]
     serializer_class = TaskCreateSerializer
 
     filter_backends = (DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter)
-    filterset_fields = {
-        'status': ['exact'],
-        'due_date': ['exact', 'gte', 'lte'],
-        'assigned_by': ['exact'],
-        'project': ['exact'],
-        'need_approval': ['exact'],
-        'created_at': ['gte', 'lte'],
-    }
+    filterset_class = TaskFilterSet
     search_fields = ['name', 'description']
-    ordering_fields = ['due_date', 'status', 'created_at', 'total_assignees']
-    ordering = ['-due_date']
+    # Cursor pagination needs a stable, non-null key, so created_at is the only client ordering
+    ordering_fields = ['created_at']
+    ordering = ['-created_at']
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         """
@@ -84,17 +133,25 @@ class TaskListCreateView(ListCreateAPIView):
         - The project owner
         """
         user = self.request.user
-        
-        queryset = Task.objects.select_related(
-            'project',
-            'project__owner',
-            'assigned_by'
-        ).prefetch_related(
-            'assignments__user'
-        ).filter(
-            Q(assignments__user=user) |  # Tasks assigned to user
-            Q(project__owner=user)     # Tasks in projects owned by user
-        ).distinct()
+
+        if self.request.method == 'GET':
+            # TaskListSerializer only renders these columns, so skip the rest of the row
+            queryset = Task.objects.only('id', 'name', 'due_date', 'status')
+        else:
+            queryset = Task.objects.select_related(
+                'project',
+                'project__owner',
+                'assigned_by'
+            ).prefetch_related(
+                TASK_ASSIGNMENTS_PREFETCH
+            )
+
+        # UNION of the two id sets lets each side use its own index (assignments.user_id,
+        # projects.owner_id) instead of an OR across a join, and needs no DISTINCT.
+        # order_by() clears Meta.ordering: ORDER BY isn't allowed inside a compound statement
+        assigned_task_ids = TaskAssignment.objects.filter(user=user).values('task_id').order_by()  # Tasks assigned to user
+        owned_task_ids = Task.objects.filter(project__owner=user).values('id').order_by()  # Tasks in projects owned by user
+        queryset = queryset.filter(id__in=assigned_task_ids.union(owned_task_ids))
 
         # Additional filtering options
         project_id = self.request.query_params.get('project_id')
@@ -103,7 +160,9 @@ class TaskListCreateView(ListCreateAPIView):
 
         assignee_id = self.request.query_params.get('assignee_id')
         if assignee_id:
-            queryset = queryset.filter(assignments__user_id=assignee_id)
+            queryset = queryset.filter(
+                id__in=TaskAssignment.objects.filter(user_id=assignee_id).values('task_id')
+            )
 
         priority = self.request.query_params.get('priority')
         if priority:
@@ -123,36 +182,61 @@ class TaskListCreateView(ListCreateAPIView):
         if self.request.method == 'GET':
             return TaskListSerializer 
         return TaskCreateSerializer
+
+    def list(self, request, *args, **kwargs):
+        """
+        List tasks as plain dicts. TaskListSerializer only emits simple columns,
+        so skip model instantiation and per-field serialization on this hot path.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = list(TaskListSerializer.Meta.fields)
+        # The cursor is built from the ordering column, so select it even if it isn't rendered
+        extra_fields = []
+        if self.paginator is not None:
+            ordering_field = self.paginator.get_ordering(request, queryset, self)[0].lstrip('-')
+            if ordering_field not in fields:
+                extra_fields.append(ordering_field)
+        queryset = queryset.values(*fields, *extra_fields)
+        page = self.paginate_queryset(queryset)
+        # Render copies: the paginator builds the next/previous cursors from the
+        # original rows, so the ordering column has to stay on those
+        rows = [{field: row[field] for field in fields} for row in (page if page is not None else queryset)]
+        for row in rows:
+            # Match DateTimeField output, which renders in the current time zone
+            if row['due_date']:
+                row['due_date'] = timezone.localtime(row['due_date'])
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
     
     
     def perform_create(self, serializer):
         project = serializer.validated_data['project']
-        if not ProjectMembership.objects.filter(project=project, user=self.request.user).exists():
-            return standardized_response(
-                status_code=403,
-                status_message="forbidden",
-                message="You do not have permission to create tasks for this project."
-            )
-        if not project.can_create_tasks():
+        # Annotated by ProjectWithMembershipField when the project was fetched
+        if not project.user_is_member:
+            # Raise rather than return: CreateModelMixin ignores perform_create's return value
+            raise PermissionDenied("You do not have permission to create tasks for this project.")
+        if not project.can_create_task():
             raise ValidationError(f"Cannot create tasks when project is {project.status}")
         task = serializer.save(assigned_by=self.request.user)
         assignees = serializer.validated_data.get('assignees', [])
-        task_content_type = ContentType.objects.get_for_model(Task)
+        task_content_type_id = get_content_type_id(Task)
         request = self.request
 
         # Send notifications to assignees
-        for assignee in assignees:
-            send_real_time_notification(
-                user=assignee,
+        if assignees:
+            transaction.on_commit(partial(
+                send_real_time_notifications_bulk.delay,
+                [assignee.id for assignee in assignees],
                 message={
                     "title": "New Task Assigned",
                     "body": f"You have been assigned to the task '{task.name}'.",
-                    "url": request.build_absolute_uri(reverse('task-retrieve-update-destroy', kwargs={'pk': task.id})),
+                    "url": absolute_url(request, reverse_pk('task-retrieve-update-destroy', task.id)),
                 },
                 notification_type="task",
-                content_type=task_content_type.id,
+                content_type=task_content_type_id,
                 object_id=task.id
-            )
+            ))
         return standardized_response(
             status_code=201,
             status_message="success",
@@ -168,7 +252,8 @@ class TaskListCreateView(ListCreateAPIView):
             OpenApiParameter(name='assigned_by', description='Filter tasks by assigner ID', required=False, type=int),
             OpenApiParameter(name='project', description='Filter tasks by project ID', required=False, type=int),
             OpenApiParameter(name='need_approval', description='Filter tasks requiring approval', required=False, type=bool),
-            OpenApiParameter(name='page', description='Page number for pagination', required=False, type=int),
+            OpenApiParameter(name='ordering', description='created_at or -created_at; defaults to -created_at (newest first)', required=False, type=str),
+            OpenApiParameter(name='cursor', description='Opaque cursor taken from the previous response\'s next/previous link', required=False, type=str),
             OpenApiParameter(name='page_size', description='Number of items per page', required=False, type=int),
         ],
         request=TaskCreateSerializer,
@@ -240,11 +325,11 @@ class TaskRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
     """
     queryset = Task.objects.all()
     permission_classes = [IsAuthenticated, IsTaskAssignee | CanManageTask]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [FastUserRateThrottle]
     serializer_class = TaskUpdateSerializer
 
     filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
-    filterset_fields = ['status', 'due_date', 'assigned_by', 'project']  # Fields to filter by
+    filterset_class = TaskDetailFilterSet  # Fields to filter by
     ordering_fields = ['due_date', 'status', 'created_at']  # Allow ordering by these fields
     ordering = ['-due_date']  # Default ordering by due_date descending
 
@@ -265,14 +350,15 @@ class TaskRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
             'project',                     # Use select_related for the project field (foreign key)
             'project__owner'               # Use select_related for the project's owner (foreign key)
         ).prefetch_related(
-            'assignments__user'            # Use prefetch_related for many-to-many relationships (task assignments)
+            TASK_ASSIGNMENTS_PREFETCH      # Only the assignment columns rendered; users render as PKs
         )
 
         # Filter tasks so that only those assigned to the user (or project owner) are returned
         user = self.request.user
         queryset = queryset.filter(
-            Q(assignments__user=user) | Q(project__owner=user)
-        ).distinct()  # Ensure distinct tasks are returned in case of multiple assignees
+            Q(id__in=TaskAssignment.objects.filter(user=user).values('task_id')) |
+            Q(project__owner=user)
+        )  # Subquery instead of a join, so each task appears once without DISTINCT
 
         # Apply additional filtering to the queryset if needed
         status_filter = self.request.query_params.get('status', None)
@@ -299,13 +385,12 @@ class TaskRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
         }
     )
     def get(self, request, *args, **kwargs):
-        task = self.get_object()
-        serializer = TaskDetailSerializer(task, context={'request': request})
+        response = super().get(request, *args, **kwargs)
         return standardized_response(
             status_code=status.HTTP_200_OK,
             status_message="success",
             message="Task details retrieved successfully.",
-            data=serializer.data
+            data=response.data
         )
 
     @extend_schema(
@@ -473,58 +558,65 @@ class TaskRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
         updated_task = serializer.save()
         add_assignees = serializer.context.get('new_assignees', [])
         remove_assignees = serializer.context.get('removed_assignees', [])
-        print(remove_assignees)
-        task_content_type = ContentType.objects.get_for_model(Task)
+        task_content_type_id = get_content_type_id(Task)
 
         # Notify users added to the task
-        for assignee in add_assignees:
-            send_real_time_notification(
-                user=assignee,
+        if add_assignees:
+            transaction.on_commit(partial(
+                send_real_time_notifications_bulk.delay,
+                [assignee.id for assignee in add_assignees],
                 message={
                     "title": "Task Assigned",
                     "body": f"You have been assigned to the task '{updated_task.name}'.",
-                    "url": request.build_absolute_uri(reverse('task-retrieve-update-destroy', kwargs={'pk': updated_task.id})),
+                    "url": absolute_url(request, reverse_pk('task-retrieve-update-destroy', updated_task.id)),
                 },
                 notification_type="task",
-                content_type=task_content_type.id,
+                content_type=task_content_type_id,
                 object_id=updated_task.id
-            )
+            ))
         
         # Notify users removed from the task
-        for assignee in remove_assignees:
-            send_real_time_notification(
-                user=assignee,
+        if remove_assignees:
+            transaction.on_commit(partial(
+                send_real_time_notifications_bulk.delay,
+                [assignee.id for assignee in remove_assignees],
                 message={
                     "title": "Task Unassigned",
                     "body": f"You have been unassigned from the task '{updated_task.name}'.",
-                    "url": request.build_absolute_uri(reverse('task-list-create')),
+                    "url": absolute_url(request, cached_reverse('task-list-create')),
                 },
                 notification_type="task",
-                content_type=task_content_type.id,
+                content_type=task_content_type_id,
                 object_id=updated_task.id
-            )
+            ))
 
     def perform_destroy(self, instance):
         """
         Delete the task and its associated task assignments.
         """
-        task_content_type = ContentType.objects.get_for_model(Task)
+        task_content_type_id = get_content_type_id(Task)
         request = self.request
-        for assignee in instance.assignments.all():
-            send_real_time_notification.delay(
-                user=assignee,
+        # Capture what the notification needs before the row is gone
+        task_id, task_name = instance.id, instance.name
+        assignee_ids = [assignment.user_id for assignment in instance.assignments.all()]
+
+        # Assignments are removed by the FK cascade within the same delete transaction
+        instance.delete()
+
+        if assignee_ids:
+            transaction.on_commit(partial(
+                send_real_time_notifications_bulk.delay,
+                assignee_ids,
                 message={
                     "title": "Task Deleted",
-                    "body": f"The task '{instance.name}' has been deleted.",
-                    "url": request.build_absolute_uri(reverse('task-list-create')),
+                    "body": f"The task '{task_name}' has been deleted.",
+                    "url": absolute_url(request, cached_reverse('task-list-create')),
                 },
                 notification_type="task",
-                content_type=task_content_type.id,
-                object_id=instance.id
-            )
-        TaskAssignment.objects.filter(task=instance).delete()
-        instance.delete()
-        
+                content_type=task_content_type_id,
+                object_id=task_id
+            ))
+
 class TaskStatusChangeView(APIView):
     """
     API view for updating the task status without requiring approval.
@@ -571,7 +663,7 @@ class TaskStatusChangeView(APIView):
             Response with status code 200 for successful updates or 400 for failed validation.
         """
         try:
-            task = Task.objects.get(id=pk)
+            task = Task.objects.select_related('project').get(id=pk)
         except Task.DoesNotExist:
             return Response({"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND)
         if not task.can_perform_activity:
@@ -579,26 +671,30 @@ class TaskStatusChangeView(APIView):
         if task.need_approval:
             raise PermissionDenied("Task requires approval to change status.")
         
-        if not TaskAssignment.objects.filter(task=task, user=request.user).exists():
+        # One query both authorizes the caller and gives the assignees notified below
+        assignee_ids = list(task.assignments.values_list('user_id', flat=True))
+        if request.user.id not in assignee_ids:
             raise PermissionDenied("You must be assigned to the task to change its status.")
 
         serializer = TaskStatusChangeSerializer(task, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             request = self.request
+            task_content_type_id = get_content_type_id(Task)
             # Send notification to all assignees about the status change
-            for assignee in task.assignees.all():
-                send_real_time_notification.delay(
-                    user=assignee,
+            if assignee_ids:
+                transaction.on_commit(partial(
+                    send_real_time_notifications_bulk.delay,
+                    assignee_ids,
                     message={
                         "title": "Task Status Updated",
                         "body": f"The status of the task '{task.name}' has been updated to '{serializer.validated_data['status']}'.",
-                        "url": request.build_absolute_uri(reverse('task-retrieve-update-destroy', kwargs={'pk': task.id})),
+                        "url": absolute_url(request, reverse_pk('task-retrieve-update-destroy', task.id)),
                     },
                     notification_type="task",
-                    content_type=ContentType.objects.get_for_model(Task).id,
+                    content_type=task_content_type_id,
                     object_id=task.id
-                )
+                ))
             return Response({"detail": "Task status updated successfully."}, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -606,15 +702,20 @@ class TaskStatusChangeView(APIView):
 class CommentListCreateView(ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated, IsTaskAssignee | CanManageTask]
     filter_backends = [PermissionBasedFilterBackend, DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
-    filterset_fields = ['task']
-    ordering_fields = ['created_at', 'updated_at']
+    filterset_class = CommentFilterSet
+    # updated_at changes as comments are edited, so it can't key a cursor
+    ordering_fields = ['created_at']
     ordering = ['-created_at']
     search_fields = ['content', 'author__username']
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [FastUserRateThrottle]
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
-        queryset = Comment.objects.select_related('author', 'task', 'task__project').prefetch_related('mentioned_users')
-        
+        # CommentListSerializer renders the author as a PK and only the task's id/name
+        queryset = Comment.objects.with_has_replies().select_related('task').only(
+            *COMMENT_LIST_FIELDS
+        )
+
         # Handle parent_id filter
         parent_id = self.request.query_params.get('parent_id')
         if parent_id:
@@ -637,7 +738,7 @@ class CommentListCreateView(ListCreateAPIView):
             OpenApiParameter(name='project_id', description='ID of the project', required=False, type=int),
             OpenApiParameter(name='parent_id', description='ID of the parent comment for replies', required=False, type=int),
             OpenApiParameter(name='search', description='Search comments by content or author username', required=False, type=str),
-            OpenApiParameter(name='page', description='Page number for pagination', required=False, type=int),
+            OpenApiParameter(name='cursor', description='Opaque cursor taken from the previous response\'s next/previous link', required=False, type=str),
             OpenApiParameter(name='page_size', description='Number of items per page', required=False, type=int),
         ],
         responses={
@@ -648,92 +749,93 @@ class CommentListCreateView(ListCreateAPIView):
     )
     def post(self, request, *args, **kwargs):
         """
-        Create a new comment after checking project status.
+        Create a new comment. The project status is checked by
+        CommentCreateSerializer.validate_task against the task it already fetched.
         """
-        task_id = request.data.get('task')
-        task = Task.objects.select_related('project').get(id=task_id)
-        
-        # Check project status
-        if task.project.status == 'completed':
-            return Response(
-                {"error": "Cannot add comments to a completed project"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-            
-        if task.project.status in ['not_started', 'on_hold']:
-            return Response(
-                {"error": f"Cannot add comments when project is {task.project.status}"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
         response = super().post(request, *args, **kwargs)
         if response.status_code == status.HTTP_201_CREATED:
-            self.send_notifications(response.data['id'])
+            self.send_notifications(self._created_comment)
         return response
 
-    def send_notifications(self, comment_id):
-        comment = Comment.objects.select_related('parent', 'parent__author', 'task').get(id=comment_id)
-        request = self.request
-        content_type = ContentType.objects.get_for_model(Comment)
-
-        for user in comment.mentioned_users.all():
-            self.send_mention_notification(user, comment, request, content_type)
-
-        if comment.parent and comment.parent.author != request.user:
-            self.send_reply_notification(comment, request, content_type)
-
-        # Notify task assignees about the new comment
-        task_assignees = comment.task.assignments.exclude(user=request.user).select_related('user')
-        for assignment in task_assignees:
-            self.send_task_comment_notification(assignment.user, comment, request, content_type)
+    def perform_create(self, serializer):
+        # Keep the saved instance so notifications don't refetch the new comment
+        self._created_comment = serializer.save()
 
-    def send_mention_notification(self, user, comment, request, content_type):
-        send_real_time_notification(
-            user=user,
+    def send_notifications(self, comment):
+        request = self.request
+        content_type_id = get_content_type_id(Comment)
+        # Resolve the comment URL once for every notification that links to it
+        comment_url = absolute_url(request, reverse_pk('comment-detail', comment.id))
+
+        mentioned_user_ids = set(
+            comment.mentioned_users.values_list('id', flat=True)
+        ) - {request.user.id}
+        if mentioned_user_ids:
+            self.send_mention_notification(list(mentioned_user_ids), comment, request, content_type_id, comment_url)
+
+        if comment.parent and comment.parent.author_id != request.user.id:
+            self.send_reply_notification(comment, request, content_type_id, comment_url)
+
+        # Notify task assignees about the new comment; the validated task carries prefetched assignee ids
+        assignee_ids = list(get_assignee_ids(comment.task) - {request.user.id})
+        if assignee_ids:
+            self.send_task_comment_notification(assignee_ids, comment, request, content_type_id)
+
+    def send_mention_notification(self, user_ids, comment, request, content_type_id, comment_url):
+        transaction.on_commit(partial(
+            send_real_time_notifications_bulk.delay,
+            user_ids,
             message={
                 "title": "You were mentioned in a comment",
                 "body": f"{request.user.username} mentioned you in a comment: '{comment.content[:50]}...'",
-                "url": request.build_absolute_uri(reverse('comment-detail', kwargs={'pk': comment.id})),
+                "url": comment_url,
             },
             notification_type="comment_mention",
-            content_type=content_type.id,
+            content_type=content_type_id,
             object_id=comment.id
-        )
+        ))
 
-    def send_reply_notification(self, comment, request, content_type):
-        send_real_time_notification(
-            user=comment.parent.author,
+    def send_reply_notification(self, comment, request, content_type_id, comment_url):
+        transaction.on_commit(partial(
+            send_real_time_notifications_bulk.delay,
+            [comment.parent.author_id],
             message={
                 "title": "New Reply to Your Comment",
                 "body": f"{request.user.username} replied to your comment: '{comment.content[:50]}...'",
-                "url": request.build_absolute_uri(reverse('comment-detail', kwargs={'pk': comment.id})),
+                "url": comment_url,
             },
             notification_type="comment_reply",
-            content_type=content_type.id,
+            content_type=content_type_id,
             object_id=comment.parent.id
-        )
+        ))
 
-    def send_task_comment_notification(self, user, comment, request, content_type):
-        send_real_time_notification(
-            user=user,
+    def send_task_comment_notification(self, user_ids, comment, request, content_type_id):
+        transaction.on_commit(partial(
+            send_real_time_notifications_bulk.delay,
+            user_ids,
             message={
                 "title": "New Comment on Task",
                 "body": f"{request.user.username} commented on task '{comment.task.name}': '{comment.content[:50]}...'",
-                "url": request.build_absolute_uri(reverse('task-detail', kwargs={'pk': comment.task.id})),
+                "url": absolute_url(request, reverse_pk('task-retrieve-update-destroy', comment.task.id)),
             },
             notification_type="task_comment",
-            content_type=content_type.id,
+            content_type=content_type_id,
             object_id=comment.id
-        )
+        ))
 
 class CommentDetailView(RetrieveUpdateDestroyAPIView):
     """
     API view to retrieve, update, or delete a specific comment.
     """
-    queryset = Comment.objects.select_related('author', 'task', 'task__project').prefetch_related('mentioned_users')
+    queryset = Comment.objects.with_has_replies().select_related(
+        'author', 'task', 'task__project'
+    ).prefetch_related(
+        # mentioned_users render as PKs and notifications only need ids
+        Prefetch('mentioned_users', queryset=User.objects.only('id'))
+    )
     serializer_class = CommentDetailSerializer
     permission_classes = [IsAuthenticated, IsTaskAssignee | CanManageTask]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [FastUserRateThrottle]
 
     @extend_schema(
         summary="Retrieve, Update or Delete a Comment",
@@ -751,8 +853,29 @@ class CommentDetailView(RetrieveUpdateDestroyAPIView):
     def get(self, request: Any, *args: Any, **kwargs: Any) -> Response:
         """
         Handle GET request to retrieve comment details.
+        Answers 304 when the client's ETag still matches, skipping the full fetch and serialization.
         """
-        return super().get(request, *args, **kwargs)
+        # Lean lookup for the permission and ETag checks: one row with just the rendered
+        # values that can change, no author join and no mentioned_users prefetch
+        lean_comment = get_object_or_404(
+            Comment.objects.annotate(
+                task_name=F('task__name'), project_name=F('task__project__name')
+            ).only('id', 'task_id', 'updated_at', 'reply_count', 'mention_count'),
+            pk=kwargs[self.lookup_url_kwarg or self.lookup_field]
+        )
+        self.check_object_permissions(request, lean_comment)
+        # reply_count is bumped with a queryset update that doesn't touch updated_at, and the
+        # task and project names are rendered too, so renames must change the ETag
+        etag = quote_etag(hashlib.md5(
+            f"{lean_comment.id}-{lean_comment.updated_at.timestamp()}-{lean_comment.reply_count}-"
+            f"{lean_comment.mention_count}-{lean_comment.task_name}-{lean_comment.project_name}".encode()
+        ).hexdigest())
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        comment = self.get_object()
+        serializer = self.get_serializer(comment)
+        return Response(serializer.data, headers={'ETag': etag})
 
     @extend_schema(
         summary="Update a Comment",
@@ -773,41 +896,40 @@ class CommentDetailView(RetrieveUpdateDestroyAPIView):
         comment = self.get_object()
         
         # Check project status
-        if comment.task.project.status == 'completed':
+        project_status = comment.task.project.status
+        if project_status in COMMENT_LOCKED_PROJECT_STATUSES:
             return Response(
-                {"error": "Cannot update comments in a completed project"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-            
-        if comment.task.project.status in ['not_started', 'on_hold']:
-            return Response(
-                {"error": f"Cannot update comments when project is {comment.task.project.status}"},
+                {"error": f"Cannot update comments when project is {project_status}"},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        original_mentioned_users = set(comment.mentioned_users.all())
-        response = super().put(request, *args, **kwargs)
-
-        if response.status_code == 200:
-            updated_comment = self.get_object()
-            updated_mentioned_users = set(updated_comment.mentioned_users.all())
-            request = self.request
-            new_mentions = updated_mentioned_users - original_mentioned_users
-            
-            for user in new_mentions:
-                send_real_time_notification(
-                    user=user,
-                    message={
-                        "title": "You were mentioned in a comment",
-                        "body": f"{request.user.username} mentioned you in an updated comment: '{updated_comment.content}'",
-                        "url": request.build_absolute_uri(reverse('comment-detail', kwargs={'pk': updated_comment.id})),
-                    },
-                    notification_type="task",
-                    content_type=ContentType.objects.get_for_model(Comment).id,
-                    object_id=updated_comment.id
-                )
+        # Served from the prefetch cache on the queryset
+        original_mentioned_ids = {user.id for user in comment.mentioned_users.all()}
+
+        # Update the instance fetched above rather than letting UpdateModelMixin.update fetch it again
+        serializer = self.get_serializer(comment, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        comment._prefetched_objects_cache = {}
+        data = serializer.data
+
+        # The response already carries the updated mention ids and content, so no refetch is needed
+        new_mention_ids = set(data['mentioned_users']) - original_mentioned_ids
+        if new_mention_ids:
+            transaction.on_commit(partial(
+                send_real_time_notifications_bulk.delay,
+                list(new_mention_ids),
+                message={
+                    "title": "You were mentioned in a comment",
+                    "body": f"{request.user.username} mentioned you in an updated comment: '{data['content']}'",
+                    "url": absolute_url(request, reverse_pk('comment-detail', comment.id)),
+                },
+                notification_type="task",
+                content_type=get_content_type_id(Comment),
+                object_id=comment.id
+            ))
 
-        return response
+        return Response(data)
 
     @extend_schema(
         summary="Delete a Comment",
@@ -838,7 +960,9 @@ class CommentRepliesView(ListAPIView):
     permission_classes = [IsAuthenticated, IsTaskAssignee | CanManageTask]
     def get_queryset(self):
         comment_id = self.kwargs['pk']
-        return Comment.objects.filter(parent_id=comment_id).select_related('author')
+        return Comment.objects.with_has_replies().filter(parent_id=comment_id).select_related(
+            'task'
+        ).only(*COMMENT_LIST_FIELDS)
 class StatusChangeRequestListCreateView(ListCreateAPIView):
     """
     API view for listing and creating status change requests.
@@ -847,7 +971,7 @@ class StatusChangeRequestListCreateView(ListCreateAPIView):
     serializer_class = StatusChangeRequestSerializer
     permission_classes = [IsAuthenticated, IsTaskAssignee | CanManageTask]
     
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [FastUserRateThrottle]
 
     @extend_schema(
         summary="List Status Change Requests",
@@ -869,7 +993,8 @@ class StatusChangeRequestListCreateView(ListCreateAPIView):
         """
         Optionally filter status change requests by task or project.
         """
-        queryset = StatusChangeRequest.objects.select_related('task', 'user')
+        # user and approved_by render as PKs straight from the FK columns, so only the task is joined
+        queryset = StatusChangeRequest.objects.select_related('task')
         task_id = self.request.query_params.get('task_id')
         project_id = self.request.query_params.get('project_id')
 
@@ -911,29 +1036,30 @@ class StatusChangeRequestListCreateView(ListCreateAPIView):
         Automatically set the user making the request as the creator.
         """
         project = serializer.validated_data['task'].project
-        if project.status == 'completed':
-            raise ValidationError("Cannot create status change requests for completed projects.")
-        if project.status == 'on_hold':
-            raise ValidationError("Cannot create status change requests for on hold projects.")
+        if project.status in STATUS_REQUEST_LOCKED_PROJECT_STATUSES:
+            raise ValidationError(f"Cannot create status change requests for {project.get_status_display().lower()} projects.")
         status_request = serializer.save(user=self.request.user)
         request = self.request
-        send_real_time_notification(
-            user=status_request.task.assigned_by,
+        transaction.on_commit(partial(
+            send_real_time_notifications_bulk.delay,
+            [status_request.task.assigned_by_id],
             message={
                 "title": "Status Change Request",
                 "body": f"'{self.request.user}' created a status change request for task: '{status_request.task.name}'.",
-                "url": request.build_absolute_uri(reverse('status-change-request-retrieve-update-destroy', kwargs={'pk': status_request.task.id}))
+                "url": absolute_url(request, reverse_pk('status-change-request-retrieve-update-destroy', status_request.id))
             },
             notification_type="task",
-            content_type=ContentType.objects.get_for_model(StatusChangeRequest).id,
+            content_type=get_content_type_id(StatusChangeRequest),
             object_id=status_request.id
-        )
+        ))
 
 class StatusChangeRequestRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
     """
     API view for retrieving, updating, or deleting a specific status change request.
     """
-    queryset = StatusChangeRequest.objects.all()
+    queryset = StatusChangeRequest.objects.select_related('task__project').prefetch_related(
+        Prefetch('task__assignments', queryset=ASSIGNEE_IDS_PREFETCH.queryset)
+    )
     serializer_class = StatusChangeRequestSerializer
     permission_classes = [IsAuthenticated, IsTaskAssignee | CanManageTask]
 
@@ -967,10 +1093,8 @@ class StatusChangeRequestRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView)
     )
     def perform_update(self, serializer):
         project = serializer.instance.task.project
-        if project.status == 'completed':
-            raise ValidationError("Cannot update status change requests for completed projects.")
-        if project.status == 'on_hold':
-            raise ValidationError("Cannot update status change requests for on hold projects.")
+        if project.status in STATUS_REQUEST_LOCKED_PROJECT_STATUSES:
+            raise ValidationError(f"Cannot update status change requests for {project.get_status_display().lower()} projects.")
         super().perform_update(serializer)
 
     @extend_schema(
@@ -1015,15 +1139,24 @@ class StatusChangeRequestAcceptRejectView(APIView):
     )
 
     def post(self, request, pk):
-        try:
-            status_change_request = StatusChangeRequest.objects.get(id=pk)
-            action = request.data.get('action')
+        action = request.data.get('action')
+
+        if action not in ['accept', 'reject']:
+            return standardized_response(
+                status_code=400,
+                status_message="validation_error",
+                message="Invalid action. Must be 'accept' or 'reject'."
+            )
 
-            if action not in ['accept', 'reject']:
+        # Lock the request row so concurrent accept/reject calls can't both see it pending,
+        # and commit the request and task updates together
+        with transaction.atomic():
+            status_change_request = StatusChangeRequest.objects.select_for_update().select_related('task').filter(id=pk).first()
+            if status_change_request is None:
                 return standardized_response(
-                    status_code=400,
-                    status_message="validation_error",
-                    message="Invalid action. Must be 'accept' or 'reject'."
+                    status_code=404,
+                    status_message="not_found",
+                    message="Status change request not found."
                 )
 
             if status_change_request.status != 'pending':
@@ -1038,48 +1171,29 @@ class StatusChangeRequestAcceptRejectView(APIView):
                 status_change_request.status = 'approved'
                 status_change_request.task.status = 'completed'
                 status_change_request.approved_by = request.user
-                status_change_request.task.save()
+                status_change_request.task.save(update_fields=['status', 'updated_at'])
             else:
                 status_change_request.status = 'rejected'
 
-            status_change_request.save()
-            request = self.request
+            status_change_request.save(update_fields=['status', 'approved_by'])
             # Send notification
-            send_real_time_notification(
-                user=status_change_request.user,
+            transaction.on_commit(partial(
+                send_real_time_notifications_bulk.delay,
+                [status_change_request.user_id],
                 message={
                     "title": "Status Change Request Update",
                     "body": f"Your status change request for '{status_change_request.task.name}' has been '{action}'ed.",
-                    "url": request.build_absolute_uri(reverse('accept-reject-status-change-request', kwargs={'pk': status_change_request.id}))
+                    "url": absolute_url(request, reverse_pk('accept-reject-status-change-request', status_change_request.id))
                 },
                 notification_type="task",
-                content_type=ContentType.objects.get_for_model(StatusChangeRequest).id,
+                content_type=get_content_type_id(StatusChangeRequest),
                 object_id=status_change_request.id
-            )
-
-            serializer = StatusChangeRequestSerializer(status_change_request)
-            return standardized_response(
-                status_code=200,
-                status_message="success",
-                message=f"Status change request {action}ed successfully.",
-                data=serializer.data
-            )
+            ))
 
-        except StatusChangeRequest.DoesNotExist:
-            return standardized_response(
-                status_code=404,
-                status_message="not_found",
-                message="Status change request not found."
-            )
-        except PermissionDenied as e:
-            return standardized_response(
-                status_code=403,
-                status_message="permission_denied",
-                message=str(e)
-            )
-        except Exception as e:
-            return standardized_response(
-                status_code=500,
-                status_message="server_error",
-                message="Failed to process status change request."
-            )
\ No newline at end of file
+        serializer = StatusChangeRequestSerializer(status_change_request)
+        return standardized_response(
+            status_code=200,
+            status_message="success",
+            message=f"Status change request {action}ed successfully.",
+            data=serializer.data
+        )
\ No newline at end of file
@@ -13,11 +13,6 @@ class UserAdmin(admin.ModelAdmin):
     list_select_related = ('profile', )
     search_fields = ('username', 'email', 'first_name', 'last_name')
     ordering = ('username', )
-    
-    def get_queryset(self, request):
-        queryset = super().get_queryset(request)
-        queryset = queryset.prefetch_related('profile')
-        return queryset
 
     def profile_picture(self, instance):
         return instance.profile.profilePicture.url
@@ -29,10 +24,6 @@ class UserAdmin(admin.ModelAdmin):
 
     profile_picture_change_count.short_description = 'Profile Picture Change Count'
     
-    def profile_picture_change_count(self, instance):
-        return instance.profile.profile_picture_change_count
-
-    profile_picture_change_count.short_description = 'Profile Picture Change Count'
         
 class OTPVerificationAdmin(admin.ModelAdmin):
     list_display = ('user', 'email', 'purpose', 'created_at', 'is_verified')
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.utils.timezone import now
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that reuses the result LastSeenMiddleware already decoded
+    for this request instead of verifying the token a second time.
+    """
+    def authenticate(self, request):
+        # DRF's Request proxies unknown attributes to the underlying HttpRequest
+        auth_result = getattr(request, '_jwt_auth_result', None)
+        if auth_result is not None:
+            return auth_result
+        return super().authenticate(request)
+
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """
+    Refresh token whose blacklist check consults the cache before the database.
+    Only blacklisted jtis are cached, so a token blacklisted by any other path
+    is still caught by the database check.
+    """
+    def check_blacklist(self):
+        if cache.get(self.blacklist_cache_key()):
+            raise TokenError(_("Token is blacklisted"))
+        try:
+            super().check_blacklist()
+        except TokenError:
+            self.cache_blacklisted()
+            raise
+
+    def blacklist(self):
+        blacklisted_token = super().blacklist()
+        self.cache_blacklisted()
+        return blacklisted_token
+
+    def blacklist_cache_key(self):
+        return f"jwt_bl:{self.payload[api_settings.JTI_CLAIM]}"
+
+    def cache_blacklisted(self):
+        # Once the token expires it is rejected without the blacklist anyway
+        remaining = int(self.payload['exp'] - now().timestamp())
+        if remaining > 0:
+            cache.set(self.blacklist_cache_key(), True, remaining)
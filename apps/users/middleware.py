@@ -1,31 +1,70 @@
 import logging
+from django.conf import settings
 from django.utils import timezone
 from django.core.cache import cache
+from django_redis import get_redis_connection
 from datetime import timedelta
 
 logger = logging.getLogger('project_planner')
 
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+LAST_SEEN_REFRESH_INTERVAL = timedelta(minutes=5)
+# Sorted set of user id -> last seen epoch seconds, flushed to the DB by core.tasks.update_last_seen
+LAST_SEEN_PENDING_KEY = 'project_planner:last_seen_pending'
+# Per-process record of when each user's last_seen was last written to the shared cache,
+# so active users don't cost a cache round-trip on every request
+_LOCAL_LAST_SEEN = {}
+_LOCAL_LAST_SEEN_MAXSIZE = 10_000
+
+
 class LastSeenMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
         self.jwt_authentication = JWTAuthentication()
+        self.skip_path_prefixes = tuple(getattr(settings, 'LAST_SEEN_SKIP_PATH_PREFIXES', ()))
 
     def __call__(self, request):
+        # Anonymous and session-only requests carry no bearer token, so skip the decode entirely,
+        # as do paths that don't count as user activity (static files, admin, API docs)
+        if 'HTTP_AUTHORIZATION' not in request.META or request.path.startswith(self.skip_path_prefixes):
+            return self.get_response(request)
+
+        user = None
         try:
             auth_result = self.jwt_authentication.authenticate(request)
             if auth_result:
                 user, token = auth_result
                 request.user = user
-                
-                cache_key = f'user_last_seen_{user.id}'
-                last_seen = cache.get(cache_key)
-
-                if not last_seen or (timezone.now() - last_seen) > timedelta(minutes=5):
-                    cache.set(cache_key, timezone.now(), 60 * 60)
+                # Picked up by CachedJWTAuthentication so DRF doesn't verify the token again
+                request._jwt_auth_result = auth_result
         except Exception as e:
             logger.debug(f"JWT Authentication error: {str(e)}")
 
         response = self.get_response(request)
+
+        # Record activity after the response is built so the client never waits on the cache
+        if user is not None:
+            self.touch_last_seen(user.id)
         return response
+
+    def touch_last_seen(self, user_id):
+        current_time = timezone.now()
+        local_last_seen = _LOCAL_LAST_SEEN.get(user_id)
+        if local_last_seen and (current_time - local_last_seen) <= LAST_SEEN_REFRESH_INTERVAL:
+            return
+
+        try:
+            # add() is a SET NX, so only the first request of each window across all
+            # processes writes the timestamp; the key's TTL is the debounce window
+            if cache.add(f'user_last_seen_window_{user_id}', True, int(LAST_SEEN_REFRESH_INTERVAL.total_seconds())):
+                get_redis_connection('default').zadd(
+                    LAST_SEEN_PENDING_KEY, {user_id: current_time.timestamp()}
+                )
+        except Exception as e:
+            logger.debug(f"Last seen cache error: {str(e)}")
+            return
+
+        if len(_LOCAL_LAST_SEEN) >= _LOCAL_LAST_SEEN_MAXSIZE:
+            _LOCAL_LAST_SEEN.clear()
+        _LOCAL_LAST_SEEN[user_id] = current_time
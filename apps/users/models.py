@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import F, Count
 from django.utils import timezone
 from datetime import timedelta
 
@@ -59,9 +60,17 @@ class Profile(models.Model):
         Updates the project counts for the user's profile.
         This should be called whenever projects are added or removed.
         """
-        self.owned_projects_count = self.user.owned_projects.count()
-        self.participated_projects_count = self.user.project_memberships.count()
-        self.save()
+        counts = User.objects.filter(pk=self.user_id).aggregate(
+            owned=Count('owned_projects', distinct=True),
+            participated=Count('project_memberships', distinct=True)
+        )
+        self.owned_projects_count = counts['owned']
+        self.participated_projects_count = counts['participated']
+        # Write just the two counters, without a full-row save or its signals
+        Profile.objects.filter(pk=self.pk).update(
+            owned_projects_count=self.owned_projects_count,
+            participated_projects_count=self.participated_projects_count
+        )
 
 
 # class UserMetadata(models.Model):
@@ -91,6 +100,15 @@ class Profile(models.Model):
 #         return f"Metadata for {self.user.username}"
 
 
+class OTPPurpose(models.TextChoices):
+    """
+    Actions an OTP can verify.
+    """
+    REGISTRATION = 'REGISTRATION', 'Registration'
+    EMAIL_CHANGE = 'EMAIL_CHANGE', 'Email Change'
+    PASSWORD_RESET = 'PASSWORD_RESET', 'Password Reset'
+
+
 class OTPVerification(models.Model):
     """
     OTPVerification model stores OTP details for actions such as registration, 
@@ -99,12 +117,8 @@ class OTPVerification(models.Model):
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     email = models.EmailField()
-    otp_secret = models.CharField(max_length=100)  # Store base32 secret
-    purpose = models.CharField(max_length=20, choices=[
-        ('REGISTRATION', 'Registration'),
-        ('EMAIL_CHANGE', 'Email Change'),
-        ('PASSWORD_RESET', 'Password Reset')
-    ])
+    otp_secret = models.CharField(max_length=100)  # SHA-256 hex digest of the OTP code
+    purpose = models.CharField(max_length=20, choices=OTPPurpose.choices)
     attempt_count = models.PositiveSmallIntegerField(default=1)  # Number of attempts made
     last_attempt = models.DateTimeField(auto_now=True)  # Timestamp of last attempt
     created_at = models.DateTimeField(auto_now_add=True)  # Timestamp when OTP was created
@@ -119,15 +133,23 @@ class OTPVerification(models.Model):
     def increment_attempt(self):
         """
         Increment the OTP attempt count and update the last attempt timestamp.
+        The increment runs in the database so concurrent attempts aren't lost.
         """
+        last_attempt = timezone.now()
+        OTPVerification.objects.filter(pk=self.pk).update(
+            attempt_count=F('attempt_count') + 1,
+            last_attempt=last_attempt
+        )
         self.attempt_count += 1
-        self.last_attempt = timezone.now()
-        self.save()
+        self.last_attempt = last_attempt
 
     @classmethod
     def cleanup_expired_otps(cls):
         """
         Clean up OTPs that are older than 2 hours.
+        Nothing cascades from OTPVerification and no delete signals are connected,
+        so Django issues a single DELETE against the created_at index without loading rows.
         """
         expiry_time = timezone.now() - timedelta(hours=2)
-        cls.objects.filter(created_at__lt=expiry_time).delete()
+        deleted_count, _ = cls.objects.filter(created_at__lt=expiry_time).delete()
+        return deleted_count
@@ -1,15 +1,23 @@
 # App imports
 from apps import subscriptions
-from apps.users.models import Profile, OTPVerification, User
+from apps.users.models import Profile, OTPPurpose, OTPVerification, User
+from apps.users.authentication import CachedBlacklistRefreshToken
 from apps.users.utils import OTPHandler
+from core.tasks import send_otp
 from apps.subscriptions.serializers import SubscriptionSerializer
 # Django imports
-import pyotp
+import hashlib
+import secrets
+from functools import partial
 from django.contrib.auth.password_validation import validate_password
+from django.core.cache import cache
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Manager, Q, prefetch_related_objects
+from django.utils.timezone import now
 # Third-party imports
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 from rest_framework_simplejwt.tokens import UntypedToken
 
 
@@ -26,6 +34,13 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         token['role'] = user.role
         return token
 
+# Token Refresh Serializer
+class CachedBlacklistTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh serializer that checks the blacklist through the cache first.
+    """
+    token_class = CachedBlacklistRefreshToken
+
 # User Registration Serializer
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
@@ -53,25 +68,25 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         email = validated_data.pop('email')
         validated_data.pop('password2')
 
-        # Create user with pending email for verification
-        user = User.objects.create_user(
-            email=email,
-            pending_email=email,
-            **validated_data
-        )
-        user.is_active = False  # Set user as inactive until email verification
-        user.save()
-
-        # Create profile
-        Profile.objects.create(user=user)
-        # Generate OTP for email verification
-        secret = pyotp.random_base32()
-        OTPVerification.objects.create(
-            user=user,
-            email=email,
-            otp_secret=secret,
-            purpose='REGISTRATION'
-        )
+        # One transaction so the user, profile and OTP record commit together
+        with transaction.atomic():
+            # Create user with pending email for verification, inactive until email verification
+            user = User.objects.create_user(
+                email=email,
+                pending_email=email,
+                is_active=False,
+                **validated_data
+            )
+
+            # Create profile
+            Profile.objects.create(user=user)
+            # Placeholder OTP record; the code itself is issued when the OTP is sent
+            OTPVerification.objects.create(
+                user=user,
+                email=email,
+                otp_secret=secrets.token_hex(32),
+                purpose=OTPPurpose.REGISTRATION
+            )
         return user
 
 
@@ -111,6 +126,21 @@ class DetailedUserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'last_login']
 
+class ProfileListSerializer(serializers.ListSerializer):
+    """
+    Loads each profile's user, subscription and plan in bulk before the nested
+    UserSerializer reads subscription.plan.name row by row.
+    """
+    def to_representation(self, data):
+        profiles = list(data.all() if isinstance(data, Manager) else data)
+        prefetch_related_objects(profiles, 'user__subscription__plan')
+        return super().to_representation(profiles)
+
+# User fields a profile update must never write
+PROFILE_USER_FIELD_DENYLIST = frozenset((
+    'email', 'username', 'role', 'email_verified', 'subscription', 'is_active', 'is_staff', 'is_superuser'
+))
+
 # Profile Serializer
 class ProfileSerializer(serializers.ModelSerializer):
     """
@@ -127,6 +157,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             'user', 'address', 'city', 'country', 'date_of_birth','first_name','last_name',
             'profile_picture', 'phone_number', 'pending_email', 'owned_projects_count', 'participated_projects_count'
         )
+        list_serializer_class = ProfileListSerializer
 
     def update(self, instance, validated_data):
         """
@@ -134,15 +165,17 @@ class ProfileSerializer(serializers.ModelSerializer):
         """
         # Extract and process nested user data
         user_data = validated_data.pop('user', {})
-        print(user_data)
         user = instance.user
 
-        for field, value in user_data.items():
-            # Avoid updating read-only fields like 'email' or 'username'
-            if field in ['email', 'username', 'role', 'email_verified', 'subscription', 'is_active', 'is_staff', 'is_superuser']:
-                continue
-            setattr(user, field, value)
-        user.save()
+        # Avoid updating read-only fields like 'email' or 'username'
+        safe_user_data = {
+            field: value for field, value in user_data.items()
+            if field not in PROFILE_USER_FIELD_DENYLIST
+        }
+        if safe_user_data:
+            User.objects.filter(pk=user.pk).update(**safe_user_data)
+            for field, value in safe_user_data.items():
+                setattr(user, field, value)
 
         # Handle pending email change if provided
         pending_email = validated_data.pop('pending_email', None)
@@ -152,7 +185,11 @@ class ProfileSerializer(serializers.ModelSerializer):
         # Update profile fields
         for field, value in validated_data.items():
             setattr(instance, field, value)
-        instance.save()
+        if 'profile_picture' in validated_data:
+            # The uploaded file is only written to storage by the field's pre_save
+            instance.save(update_fields=list(validated_data))
+        elif validated_data:
+            Profile.objects.filter(pk=instance.pk).update(**validated_data)
 
         return instance
 
@@ -162,7 +199,7 @@ class ProfileSerializer(serializers.ModelSerializer):
         """
         user.pending_email = pending_email
         user.email_verified = False
-        user.save()
+        user.save(update_fields=['pending_email', 'email_verified'])
 
 
 # Change Password Serializer
@@ -171,24 +208,26 @@ class ChangePasswordSerializer(serializers.Serializer):
     Serializer for changing user password.
     """
     old_password = serializers.CharField(write_only=True, required=True)
-    new_password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
+    new_password = serializers.CharField(write_only=True, required=True)
     confirm_password = serializers.CharField(write_only=True, required=True)
 
-    def validate_old_password(self, value):
-        """
-        Validate the old password.
-        """
-        user = self.context['request'].user
-        if not user.check_password(value):
-            raise serializers.ValidationError("Old password is incorrect.")
-        return value
-
     def validate(self, data):
         """
-        Validate that new_password and confirm_password match.
+        Validate that new_password and confirm_password match, then the old password,
+        then the new password's strength. The cheap comparison runs first so mismatched
+        submissions never pay for password hashing or the validators.
         """
         if data['new_password'] != data['confirm_password']:
             raise serializers.ValidationError({"confirm_password": "New passwords do not match."})
+
+        user = self.context['request'].user
+        if not user.check_password(data['old_password']):
+            raise serializers.ValidationError({"old_password": "Old password is incorrect."})
+
+        try:
+            validate_password(data['new_password'])
+        except ValidationError as e:
+            raise serializers.ValidationError({"new_password": e.messages})
         return data
 
     def save(self, **kwargs):
@@ -197,7 +236,7 @@ class ChangePasswordSerializer(serializers.Serializer):
         """
         user = self.context['request'].user
         user.set_password(self.validated_data['new_password'])
-        user.save()
+        user.save(update_fields=['password'])
 
 
 # Password Reset Request Serializer
@@ -207,13 +246,15 @@ class PasswordResetRequestSerializer(serializers.Serializer):
     """
     email = serializers.EmailField()
 
-    def validate_email(self, value):
+    def validate(self, attrs):
         """
-        Ensure that the provided email exists.
+        Ensure that the provided email exists and keep the user's id for the view.
         """
-        if not User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("No user found with this email.")
-        return value
+        user_id = User.objects.filter(email=attrs['email']).values_list('id', flat=True).first()
+        if user_id is None:
+            raise serializers.ValidationError({"email": "No user found with this email."})
+        attrs['user_id'] = user_id
+        return attrs
 
 
 # Password Reset Confirm Serializer
@@ -231,23 +272,37 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         reset_token = attrs['reset_token']
         new_password = attrs['new_password']
 
-        # Validate the new password
         try:
-            validate_password(new_password)
-        except ValidationError as e:
-            raise serializers.ValidationError({"new_password": e.messages})
-
-        try:
-            payload = UntypedToken(reset_token)
-            user_id = payload.get('user_id')
+            user_id = self.get_token_user_id(reset_token)
             user = User.objects.get(id=user_id)
         except Exception:
             raise serializers.ValidationError("Invalid or expired reset token.")
 
+        # Validate the new password only once the token is known to be good
+        try:
+            validate_password(new_password)
+        except ValidationError as e:
+            raise serializers.ValidationError({"new_password": e.messages})
+
         attrs['user'] = user
         attrs['new_password'] = new_password
         return attrs
 
+    def get_token_user_id(self, reset_token):
+        """
+        Return the user id from a verified reset token.
+        Verified tokens are cached until they expire so retried confirms skip the signature check.
+        """
+        cache_key = f"jwt:{hashlib.sha256(reset_token.encode()).hexdigest()}"
+        user_id = cache.get(cache_key)
+        if user_id is None:
+            payload = UntypedToken(reset_token)
+            user_id = payload.get('user_id')
+            remaining = int(payload['exp'] - now().timestamp())
+            if remaining > 0:
+                cache.set(cache_key, user_id, remaining)
+        return user_id
+
     def save(self, **kwargs):
         """
         Update the user's password.
@@ -255,7 +310,7 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         user = self.validated_data['user']
         new_password = self.validated_data['new_password']
         user.set_password(new_password)
-        user.save()
+        user.save(update_fields=['password'])
 
 
 # OTP Send Serializer
@@ -264,7 +319,7 @@ class OtpSendSerializer(serializers.Serializer):
     Serializer to send OTP for various purposes.
     """
     email = serializers.EmailField(required=True)
-    purpose = serializers.ChoiceField(choices=['REGISTRATION', 'EMAIL_CHANGE', 'PASSWORD_RESET'], required=True)
+    purpose = serializers.ChoiceField(choices=OTPPurpose.choices, required=True)
 
     def validate_email(self, value):
         """
@@ -272,23 +327,32 @@ class OtpSendSerializer(serializers.Serializer):
         """
         purpose = self.initial_data.get('purpose')
 
-        if purpose == 'REGISTRATION':
-            user = User.objects.filter(pending_email=value).first()
-            if not user:
+        if purpose == OTPPurpose.REGISTRATION:
+            # One query for both the pending registration and any verified account using the email
+            matches = list(
+                User.objects.filter(Q(pending_email=value) | Q(email=value))
+                .only('id', 'email', 'pending_email', 'is_active')
+            )
+            pending_user = next((match for match in matches if match.pending_email == value), None)
+            if pending_user is None:
                 raise serializers.ValidationError("No pending registration found for this email.")
-            if User.objects.filter(email=value, is_active=True).exists():
+            if any(match.email == value and match.is_active for match in matches):
                 raise serializers.ValidationError("Email is already registered and verified.")
+            # Reused by create() so the user isn't fetched twice
+            self._user = pending_user
 
-        elif purpose == 'PASSWORD_RESET':
-            if not User.objects.filter(email=value, is_active=True).exists():
+        elif purpose == OTPPurpose.PASSWORD_RESET:
+            self._user = User.objects.filter(email=value, is_active=True).only('id').first()
+            if self._user is None:
                 raise serializers.ValidationError("No active user found with this email.")
 
-        elif purpose == 'EMAIL_CHANGE':
+        elif purpose == OTPPurpose.EMAIL_CHANGE:
             user = self.context.get('request').user
             if not user.is_authenticated:
                 raise serializers.ValidationError("Authentication required for email change.")
             if User.objects.filter(email=value, is_active=True).exists():
                 raise serializers.ValidationError("This email is already in use.")
+            self._user = user
 
         return value
 
@@ -299,12 +363,7 @@ class OtpSendSerializer(serializers.Serializer):
         email = validated_data['email']
         purpose = validated_data['purpose']
 
-        user = User.objects.get(pending_email=email) if purpose == 'REGISTRATION' else User.objects.get(email=email)
-        otp_handler = OTPHandler(user=user, email=email, purpose=purpose)
-        result = otp_handler.send_otp()
-
-        if not result.get("status"):
-            raise serializers.ValidationError({"error": result.get("error", "Failed to send OTP")})
+        transaction.on_commit(partial(send_otp.delay, self._user.id, email, purpose))
 
         return {"message": f"OTP sent to {email} for {purpose.lower().replace('_', ' ')}."}
 
@@ -316,7 +375,7 @@ class OtpVerificationSerializer(serializers.Serializer):
     """
     email = serializers.EmailField()
     otp = serializers.CharField()
-    purpose = serializers.ChoiceField(choices=['REGISTRATION', 'EMAIL_CHANGE', 'PASSWORD_RESET'])
+    purpose = serializers.ChoiceField(choices=OTPPurpose.choices)
 
     def validate(self, attrs):
         """
@@ -326,12 +385,12 @@ class OtpVerificationSerializer(serializers.Serializer):
         purpose = attrs['purpose']
 
         try:
-            if purpose == 'REGISTRATION' or purpose == 'EMAIL_CHANGE':
+            if purpose in (OTPPurpose.REGISTRATION, OTPPurpose.EMAIL_CHANGE):
                 try:
                     user = User.objects.get(pending_email=email)
                 except ObjectDoesNotExist:
                     raise serializers.ValidationError({"email": "No pending registration found for this email."})
-            elif purpose == 'PASSWORD_RESET':
+            elif purpose == OTPPurpose.PASSWORD_RESET:
                 user = User.objects.get(email=email)
             otp_handler = OTPHandler(user, email, purpose)
             result, message = otp_handler.verify(attrs['otp'])
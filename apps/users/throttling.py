@@ -0,0 +1,43 @@
+from rest_framework.throttling import SimpleRateThrottle
+from core.throttling import throttle_cache as cache
+
+
+class OTPSendRateThrottle(SimpleRateThrottle):
+    """
+    Limits OTP sends per (email, purpose), so a caller can't keep generating
+    OTP records and emails for the same address by rotating IPs or accounts.
+    Uses an atomic counter instead of SimpleRateThrottle's request history list.
+    """
+    scope = 'otp_send'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if not email:
+            return None  # Nothing to send to; the serializer rejects the request
+        purpose = request.data.get('purpose') or getattr(view, 'otp_purpose', '')
+        return f"throttle_{self.scope}:{purpose}:{str(email).strip().lower()}"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        # add() only succeeds for the first send of the window and sets its expiry
+        if cache.add(self.key, 1, self.duration):
+            return True
+        try:
+            count = cache.incr(self.key)
+        except ValueError:
+            # The window expired between add() and incr(); start a new one
+            cache.add(self.key, 1, self.duration)
+            return True
+        # None means the cache is unreachable and the error was ignored; fail open
+        return count is None or count <= self.num_requests
+
+    def wait(self):
+        ttl = getattr(cache, 'ttl', None)
+        remaining = ttl(self.key) if ttl else None
+        return remaining if remaining and remaining > 0 else self.duration
@@ -1,13 +1,22 @@
 # App Imports
-from apps.users.models import OTPVerification
+from apps.users.models import OTPPurpose, OTPVerification
 from core.services.mail_service import EmailService
 # Django Imports
-import pyotp
+import hashlib
+import hmac
+import secrets
+from functools import partial
+from django.db import transaction
 from django.utils.timezone import now, timedelta
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 # Third-Party Imports
 from rest_framework_simplejwt.tokens import RefreshToken
-        
+
+# Matches the TOTP interval, after which a cached OTP is expired anyway
+OTP_CACHE_TIMEOUT = 300
+
+
 class OTPHandler:
     """
     Handler class to generate, verify, and process OTPs for different purposes (e.g., registration, email change).
@@ -25,6 +34,8 @@ class OTPHandler:
         self.purpose = purpose
         self.otp_obj = None
         self.email_service = EmailService()
+        self.cache_key = f"otp:{purpose}:{email}"
+        self.attempts_cache_key = f"otp:attempts:{purpose}:{email}"
 
     def generate(self):
         """
@@ -35,21 +46,29 @@ class OTPHandler:
             Exception: If there is an error while generating the OTP.
         """
         try:
+            # Codes are single-use and attempt-capped, so a random code is enough;
+            # only its hash is stored
+            code = f"{secrets.randbelow(10**6):06d}"
             # Create or update the OTP record in the database
             otp_record, created = OTPVerification.objects.update_or_create(
                 email=self.email,
                 purpose=self.purpose,
                 user=self.user,
                 defaults={
-                    "otp_secret": pyotp.random_base32(),  # Generate a random OTP secret
+                    "otp_secret": self.hash_code(code),
                     "created_at": now(),
                     "attempt_count": 0
                 }
             )
             self.otp_obj = otp_record
-            # Create a TOTP (Time-based One-Time Password) object with a 5-minute expiry
-            totp = pyotp.TOTP(otp_record.otp_secret, interval=300)
-            return totp.now()
+            # Cache what verify() needs so it can skip the database lookup
+            cache.set(self.cache_key, {
+                "id": otp_record.id,
+                "otp_secret": otp_record.otp_secret,
+                "created_at": otp_record.created_at,
+            }, OTP_CACHE_TIMEOUT)
+            cache.set(self.attempts_cache_key, 0, OTP_CACHE_TIMEOUT)
+            return code
 
         except Exception as e:
             raise Exception(f"Error while generating OTP: {str(e)}")
@@ -57,9 +76,11 @@ class OTPHandler:
     def send_otp(self):
         """
         Generate the OTP and send it via email.
+        The email is queued only once the OTP record is committed.
         """
-        otp = self.generate()
-        self.email_service.send_otp_email(otp, self.email)
+        with transaction.atomic():
+            otp = self.generate()
+            transaction.on_commit(partial(self.email_service.send_otp_email, otp, self.email))
 
     def verify(self, otp):
         """
@@ -69,29 +90,62 @@ class OTPHandler:
         Returns:
             tuple: A tuple containing a boolean indicating success and a message.
         """
-        try:
-            # Fetch OTP record based on email and purpose
-            otp_record = OTPVerification.objects.get(email=self.email, purpose=self.purpose)
-            self.otp_obj = otp_record
-        except ObjectDoesNotExist:
-            return False, "No pending verification found."
+        otp_record = self.get_cached_record()
+        if otp_record is None:
+            try:
+                # Fetch OTP record based on email and purpose
+                otp_record = OTPVerification.objects.get(email=self.email, purpose=self.purpose)
+            except ObjectDoesNotExist:
+                return False, "No pending verification found."
+        self.otp_obj = otp_record
 
+        # Evaluate every check before branching so timing doesn't depend on which one fails
         # Check if the OTP has expired (older than 5 minutes)
-        if otp_record.created_at < now() - timedelta(minutes=5):
-            return False, "OTP has expired."
-
+        expired = otp_record.created_at < now() - timedelta(minutes=5)
         # Check if maximum attempts have been reached
-        if otp_record.attempt_count >= 5:
-            return False, "Maximum OTP attempts reached. Please request a new OTP."
+        locked = otp_record.attempt_count >= 5
+        # Compare the OTP code in constant time
+        code_matches = hmac.compare_digest(self.hash_code(str(otp)), otp_record.otp_secret)
 
-        # Verify the OTP code using TOTP
-        totp = pyotp.TOTP(otp_record.otp_secret, interval=300)
-        if not totp.verify(otp):
-            otp_record.attempt_count += 1  # Increment attempt count
-            otp_record.save()
+        if expired:
+            return False, "OTP has expired."
+        if locked:
+            return False, "Maximum OTP attempts reached. Please request a new OTP."
+        if not code_matches:
+            otp_record.increment_attempt()
+            try:
+                cache.incr(self.attempts_cache_key)
+            except ValueError:
+                pass  # Counter expired or was never cached; the database count is authoritative
             return False, "Invalid OTP."
         return True, "OTP is valid."
 
+    @staticmethod
+    def hash_code(code):
+        """
+        Hash an OTP code for storage and comparison.
+        """
+        return hashlib.sha256(code.encode()).hexdigest()
+
+    def get_cached_record(self):
+        """
+        Rebuild the OTPVerification record from the cache, or return None on a miss.
+        The attempt count lives in its own key so failed attempts can INCR it atomically.
+        """
+        cached = cache.get_many([self.cache_key, self.attempts_cache_key])
+        record = cached.get(self.cache_key)
+        if record is None or self.attempts_cache_key not in cached:
+            return None
+        return OTPVerification(
+            id=record["id"],
+            user=self.user,
+            email=self.email,
+            purpose=self.purpose,
+            otp_secret=record["otp_secret"],
+            created_at=record["created_at"],
+            attempt_count=cached[self.attempts_cache_key],
+        )
+
     def process_verification(self):
         """
         Process the verification based on the OTP's purpose (e.g., registration, email change).
@@ -103,38 +157,56 @@ class OTPHandler:
         if not self.otp_obj:
             raise ValueError("OTP object is None. Verification cannot be processed.")
 
-        user = self.otp_obj.user
-        tokens = None
-        # Handle different OTP purposes
-        if self.purpose == 'REGISTRATION':
-            user.email_verified = True
-            user.is_active = True
-            user.email = self.otp_obj.email
-            user.pending_email = None
-            user.save()
-            # Generate tokens for auto-login
-            refresh = RefreshToken.for_user(user)
-            tokens = {
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-                'username': user.username,
-                'email': user.email,
-                'role': user.role
-            }
-        elif self.purpose == 'EMAIL_CHANGE':
-            user.email = self.otp_obj.email
-            user.pending_email = None
-            user.email_verified = True
-            user.save()
-        elif self.purpose in ['PASSWORD_RESET', 'LOGIN']:
-            # Generate reset token for password reset or login verification
-            reset_token = RefreshToken.for_user(user)
-            tokens = {
-                "message": "OTP verified successfully.",
-                "reset_token": str(reset_token.access_token)
-            }
-        else:
+        handlers = {
+            OTPPurpose.REGISTRATION: self.complete_registration,
+            OTPPurpose.EMAIL_CHANGE: self.complete_email_change,
+            OTPPurpose.PASSWORD_RESET: self.issue_reset_token,
+            'LOGIN': self.issue_reset_token,
+        }
+        handler = handlers.get(self.purpose)
+        if handler is None:
             return {'message': 'Invalid OTP purpose.'}
-        # Delete the used OTP record
-        self.otp_obj.delete()
+        tokens = handler(self.otp_obj.user)
+        # Delete the used OTP record with a plain DELETE, skipping the cascade collector
+        OTPVerification.objects.filter(pk=self.otp_obj.pk).delete()
+        cache.delete_many([self.cache_key, self.attempts_cache_key])
         return tokens
+
+    def complete_registration(self, user):
+        """
+        Activate the user with the verified email and return auto-login tokens.
+        """
+        user.email_verified = True
+        user.is_active = True
+        user.email = self.otp_obj.email
+        user.pending_email = None
+        user.save(update_fields=['email_verified', 'is_active', 'email', 'pending_email'])
+        # Generate tokens for auto-login
+        refresh = RefreshToken.for_user(user)
+        return {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'username': user.username,
+            'email': user.email,
+            'role': user.role
+        }
+
+    def complete_email_change(self, user):
+        """
+        Swap the user's email for the verified pending one.
+        """
+        user.email = self.otp_obj.email
+        user.pending_email = None
+        user.email_verified = True
+        user.save(update_fields=['email', 'pending_email', 'email_verified'])
+        return None
+
+    def issue_reset_token(self, user):
+        """
+        Generate reset token for password reset or login verification.
+        """
+        reset_token = RefreshToken.for_user(user)
+        return {
+            "message": "OTP verified successfully.",
+            "reset_token": str(reset_token.access_token)
+        }
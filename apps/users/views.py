@@ -1,6 +1,9 @@
 # App imports
-from apps.users.models import Profile, User
-from apps.users.utils import OTPHandler
+from apps.users.models import OTPPurpose, Profile, User
+from apps.users.authentication import CachedBlacklistRefreshToken
+from apps.users.throttling import OTPSendRateThrottle
+from core.throttling import FastAnonRateThrottle, FastScopedRateThrottle, FastUserRateThrottle
+from core.tasks import send_otp
 from apps.users.serializers import (
     ChangePasswordSerializer,MyTokenObtainPairSerializer,OtpVerificationSerializer,
     ProfileSerializer,PasswordResetConfirmSerializer,PasswordResetRequestSerializer,
@@ -9,9 +12,11 @@ from apps.users.serializers import (
 
 # Django imports
 from django.contrib.auth import authenticate, update_session_auth_hash
+from django.db import transaction
 from django.utils import timezone
 # Third party imports
 import logging
+from functools import partial
 from rest_framework import status, serializers
 from rest_framework.generics import CreateAPIView, RetrieveUpdateAPIView, GenericAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -32,6 +37,8 @@ logger = logging.getLogger(__name__)
 class MyTokenObtainPairView(TokenObtainPairView):
     """Custom token view that uses MyTokenObtainPairSerializer"""
     serializer_class = MyTokenObtainPairSerializer
+    throttle_classes = [FastAnonRateThrottle, FastUserRateThrottle, FastScopedRateThrottle]
+    throttle_scope = 'login'
 
 
 @extend_schema(
@@ -47,6 +54,8 @@ class SendOTPView(APIView):
     Handles OTP sending for various purposes like registration or password reset.
     """
     permission_classes = (AllowAny,)
+    throttle_classes = [FastAnonRateThrottle, FastUserRateThrottle, FastScopedRateThrottle, OTPSendRateThrottle]
+    throttle_scope = 'otp'
 
     def post(self, request, *args, **kwargs):
         serializer = OtpSendSerializer(data=request.data, context={'request': request})
@@ -70,6 +79,8 @@ class VerifyOTPView(APIView):
     Handles OTP verification for various purposes.
     """
     permission_classes = (AllowAny,)
+    throttle_classes = [FastAnonRateThrottle, FastUserRateThrottle, FastScopedRateThrottle]
+    throttle_scope = 'otp'
 
     def post(self, request):
         try:
@@ -123,8 +134,7 @@ class UserRegistrationView(CreateAPIView):
 
         if existing_user:
             # Resend OTP for existing pending user
-            otp_handler = OTPHandler(existing_user, email, 'REGISTRATION')
-            otp_handler.send_otp()
+            transaction.on_commit(partial(send_otp.delay, existing_user.id, email, OTPPurpose.REGISTRATION))
             return Response({
                 "message": "User exists but email not verified. OTP resent.",
                 "email": email
@@ -136,8 +146,7 @@ class UserRegistrationView(CreateAPIView):
         user = serializer.save()
 
         # Send OTP for email verification
-        otp_handler = OTPHandler(user, user.pending_email, 'REGISTRATION')
-        otp_handler.send_otp()
+        transaction.on_commit(partial(send_otp.delay, user.id, user.pending_email, OTPPurpose.REGISTRATION))
 
         return Response({
             "message": "Registration successful. Please verify your email.",
@@ -159,6 +168,8 @@ class UserLoginView(APIView):
     Handles user login and returns JWT tokens.
     """
     permission_classes = (AllowAny,)
+    throttle_classes = [FastAnonRateThrottle, FastUserRateThrottle, FastScopedRateThrottle]
+    throttle_scope = 'login'
     
     def post(self, request):
         serializer = UserLoginSerializer(data=request.data)
@@ -184,7 +195,8 @@ class UserLoginView(APIView):
             }, status=status.HTTP_403_FORBIDDEN)
         refresh = RefreshToken.for_user(user)
         user.last_login = timezone.now()
-        user.save()
+        # Write only last_login; a full save would rewrite the row and fire the User post_save receivers
+        User.objects.filter(pk=user.pk).update(last_login=user.last_login)
         return Response({
             'refresh': str(refresh),
             'access': str(refresh.access_token),
@@ -212,7 +224,7 @@ class LogoutView(APIView):
             # Get the refresh token from the request data
             refresh_token = request.data["refresh"]
             # Instantiate a RefreshToken object with the refresh token
-            token = RefreshToken(refresh_token)
+            token = CachedBlacklistRefreshToken(refresh_token)
             # Add the token to the blacklist
             token.blacklist()
             return Response({"message": "Logged out successfully"}, status=status.HTTP_205_RESET_CONTENT)
@@ -240,15 +252,16 @@ class ProfileView(RetrieveUpdateAPIView):
         """
         Return the profile of the authenticated user.
         This ensures only the logged-in user can access their own profile.
+        The user's subscription plan rendered by UserSerializer is joined in the same query.
         """
-        return self.request.user.profile
+        return Profile.objects.select_related('user__subscription__plan').get(user=self.request.user)
 
     def update(self, request, *args, **kwargs):
         """
         Handle profile updates for the authenticated user only.
         """
         # Ensure the request is for the logged-in user's profile
-        instance = request.user.profile
+        instance = self.get_object()
         partial = kwargs.pop('partial', True)  # Allow partial updates
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         try:
@@ -288,9 +301,8 @@ class ProfileView(RetrieveUpdateAPIView):
         Trigger the OTP process for email change verification.
         """
         try:
-            otp_handler = OTPHandler(user, pending_email, 'EMAIL_CHANGE')
-            otp_handler.send_otp()
-            logger.info(f"OTP sent to {pending_email} for user {user.username}.")
+            transaction.on_commit(partial(send_otp.delay, user.id, pending_email, OTPPurpose.EMAIL_CHANGE))
+            logger.info(f"OTP queued for {pending_email} for user {user.username}.")
         except Exception as e:
             logger.error(f"Error sending OTP for user {user.username}: {str(e)}")
             raise serializers.ValidationError({"pending_email": "Failed to send verification OTP. Please try again."})
@@ -354,7 +366,7 @@ class ChangePasswordView(APIView):
     request=PasswordResetRequestSerializer,
     responses={
         200: OpenApiResponse(description="Password reset OTP sent successfully"),
-        404: OpenApiResponse(description="User not found")
+        400: OpenApiResponse(description="No user found with this email")
     }
 )
 class PasswordResetRequestView(APIView):
@@ -362,18 +374,16 @@ class PasswordResetRequestView(APIView):
     Handles password reset requests by sending OTP.
     """
     permission_classes = (AllowAny,)
+    throttle_classes = [FastAnonRateThrottle, FastUserRateThrottle, FastScopedRateThrottle, OTPSendRateThrottle]
+    throttle_scope = 'otp'
+    otp_purpose = OTPPurpose.PASSWORD_RESET
 
     def post(self, request):
         serializer = PasswordResetRequestSerializer(data=request.data)
         if serializer.is_valid():
             email = serializer.validated_data['email']
-            try:
-                user = User.objects.get(email=email)
-            except User.DoesNotExist:
-                return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
-
-            otp_handler = OTPHandler(user, email, 'PASSWORD_RESET')
-            otp_handler.send_otp()
+            user_id = serializer.validated_data['user_id']
+            transaction.on_commit(partial(send_otp.delay, user_id, email, OTPPurpose.PASSWORD_RESET))
 
             return Response({"detail": "Password reset OTP sent successfully"}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
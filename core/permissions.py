@@ -2,40 +2,66 @@ from rest_framework import permissions
 from apps.projects.models import Project, ProjectMembership
 from apps.tasks.models import Task, TaskAssignment
 
+
+def _cached_check(request, cache_name, key, check):
+    """
+    Runs an existence check once per request and key; list views and views combining
+    several permission classes otherwise repeat the same query for every object.
+    """
+    cache = getattr(request, cache_name, None)
+    if cache is None:
+        cache = {}
+        setattr(request, cache_name, cache)
+    if key not in cache:
+        cache[key] = check()
+    return cache[key]
+
 class IsProjectOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if isinstance(obj, Project):
-            return obj.owner == request.user
+            return obj.owner_id == request.user.id
         elif hasattr(obj, 'project'):
-            return obj.project.owner == request.user
+            return obj.project.owner_id == request.user.id
         return False
 
 class IsProjectMember(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if isinstance(obj, Project):
-            return ProjectMembership.objects.filter(project=obj, user=request.user).exists()
+            project_id = obj.id
         elif hasattr(obj, 'project'):
-            return ProjectMembership.objects.filter(project=obj.project, user=request.user).exists()
-        return False
+            project_id = getattr(obj, 'project_id', None) or obj.project.pk
+        else:
+            return False
+        return _cached_check(
+            request, '_membership_cache', project_id,
+            lambda: ProjectMembership.objects.filter(project_id=project_id, user=request.user).exists()
+        )
 
 class IsTaskAssignee(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if isinstance(obj, Task):
-            return TaskAssignment.objects.filter(task=obj, user=request.user).exists()
+            task_id = obj.id
+        elif getattr(obj, 'task_id', None):
+            task_id = obj.task_id
         elif hasattr(obj, 'task'):
-            return TaskAssignment.objects.filter(task=obj.task, user=request.user).exists()
-        return False
+            task_id = obj.task.pk
+        else:
+            return False
+        return _cached_check(
+            request, '_assignment_cache', task_id,
+            lambda: TaskAssignment.objects.filter(task_id=task_id, user=request.user).exists()
+        )
 
 class CanManageTask(permissions.BasePermission):
     def has_permission(self, request, view):
         task_id = view.kwargs.get('pk')
         if task_id:
-            task = Task.objects.get(id=task_id)
-            return task.project.owner == request.user
+            owner_id = Task.objects.filter(id=task_id).values_list('project__owner_id', flat=True).first()
+            return owner_id is not None and owner_id == request.user.id
         return False
 
     def has_object_permission(self, request, view, obj):
-        return obj.project.owner == request.user or obj.assigned_by == request.user
+        return obj.project.owner_id == request.user.id or obj.assigned_by_id == request.user.id
 
 class ReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -43,5 +69,5 @@ class ReadOnly(permissions.BasePermission):
 
 class IsAdminUser(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user and request.user.role == 'admin'
-
+        # AnonymousUser has no role attribute
+        return getattr(request.user, 'role', None) == 'admin'
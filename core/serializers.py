@@ -0,0 +1,26 @@
+import copy
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField
+
+_fields_cache = {}
+
+
+class CachedFieldsMixin:
+    """
+    Opt-in for ModelSerializers: build the fields once per class and hand out copies per instance.
+    Nested serializers and many-related fields hold bound children, so they are deep copied;
+    plain fields only need a shallow copy before being bound to the instance.
+    Only use it on serializers whose fields depend on the class alone: if get_fields() or a
+    field's construction reads self.context, self.instance or the request, the first
+    instance's fields would be reused for every later one.
+    """
+    def get_fields(self):
+        cls = self.__class__
+        if cls not in _fields_cache:
+            _fields_cache[cls] = super().get_fields()
+        return {
+            name: copy.deepcopy(field)
+            if isinstance(field, (serializers.BaseSerializer, ManyRelatedField))
+            else copy.copy(field)
+            for name, field in _fields_cache[cls].items()
+        }
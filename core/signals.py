@@ -1,9 +1,12 @@
 # core/signals.py
+import threading
 from django.db.models.signals import post_save, post_delete
+from django.db import transaction
 from django.dispatch import receiver
 from apps.projects.models import ProjectMembership
 from apps.tasks.models import Task, TaskAssignment
 from apps.notifications.models import NotificationPreference
+from core.tasks import recompute_project_task_counts
 from django.contrib.auth import get_user_model
 User = get_user_model()
 
@@ -22,54 +25,48 @@ def update_user_profile_project_count(sender, instance, created, **kwargs):
         instance.user.profile.participated_projects_count += 1
         instance.user.profile.save()
         
-@receiver(post_save, sender=Task)
-def update_project_and_membership_on_task_save(sender, instance, created, **kwargs):
-    """
-    Signal to update the total task counts and completed task counts for the project
-    and related memberships when a task is created or updated.
-    """
-    project = instance.project
+# Project ids whose task counts are recomputed once the current transaction commits.
+# Thread-local, like Django's connections, so each thread batches its own transaction.
+_pending_count_refresh = threading.local()
 
-    # Only update project total tasks if there was an actual change
-    if created or instance.project.total_tasks != project.tasks.count():
-        project.total_tasks = project.tasks.count()
-        project.save()
 
-    # Update total tasks and completed tasks for each membership in the project
-    memberships = ProjectMembership.objects.filter(project=project)
+def _pending_project_ids():
+    project_ids = getattr(_pending_count_refresh, 'project_ids', None)
+    if project_ids is None:
+        project_ids = _pending_count_refresh.project_ids = set()
+    return project_ids
 
-    for membership in memberships:
-        # Update task counts only if necessary (e.g., if assignments exist or status changed)
-        membership.update_task_counts()
 
+def _flush_project_task_count_refreshes():
+    project_ids = _pending_project_ids()
+    while project_ids:
+        recompute_project_task_counts.delay(project_ids.pop())
 
-@receiver(post_save, sender=TaskAssignment)
-@receiver(post_delete, sender=TaskAssignment)
-def update_membership_on_task_assignment_change(sender, instance, **kwargs):
+
+def schedule_project_task_count_refresh(project_id):
     """
-    Signal to update task counts in project memberships when a task assignment is created or deleted.
+    Defers recomputing a project's task counts until the surrounding transaction commits,
+    so saving many tasks of one project in a transaction recomputes its counts once.
+    Every call registers the flush: the first to run after commit sends the whole batch and
+    the rest find nothing pending. Ids left behind by a rollback go out with the next flush,
+    which only costs a redundant recompute.
     """
-    project = instance.task.project
-    user = instance.user
-
-    # Only update the membership if the task assignment or deletion affects task counts
-    membership = ProjectMembership.objects.filter(project=project, user=user).first()
-    if membership:
-        membership.update_task_counts()
+    _pending_project_ids().add(project_id)
+    transaction.on_commit(_flush_project_task_count_refreshes)
 
 
 @receiver(post_save, sender=Task)
-def update_membership_on_task_status_change(sender, instance, **kwargs):
+def update_task_counts_on_task_save(sender, instance, created, **kwargs):
     """
-    Signal to update completed task counts when a task's status changes to 'completed'.
+    Signal to update the project and membership task counts when a task is created or updated.
     """
-    if instance.status == 'completed':
-        project = instance.project
+    schedule_project_task_count_refresh(instance.project_id)
+
 
-        # Update completed tasks for all memberships associated with this task
-        for assignment in instance.assignments.all():
-            membership = ProjectMembership.objects.filter(
-                project=project, user=assignment.user
-            ).first()
-            if membership:
-                membership.update_task_counts()
\ No newline at end of file
+@receiver(post_save, sender=TaskAssignment)
+@receiver(post_delete, sender=TaskAssignment)
+def update_membership_on_task_assignment_change(sender, instance, **kwargs):
+    """
+    Signal to update task counts in project memberships when a task assignment is created or deleted.
+    """
+    schedule_project_task_count_refresh(instance.task.project_id)
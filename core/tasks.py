@@ -2,16 +2,22 @@ from celery import shared_task
 from project_planner.logging import INFO, project_logger
 from apps.projects.models import Project, ProjectMembership
 from apps.tasks.models import Task, TaskAssignment
-from apps.notifications.utils import send_real_time_notification
+from apps.users.models import OTPVerification
+from apps.notifications.utils import (
+    get_content_type_id, send_real_time_notification_batch, send_real_time_notifications
+)
 from apps.notifications.models import Notification, NotificationPreference
 from django.core.mail import EmailMultiAlternatives
 from django.core.cache import cache
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, F, OuterRef, Prefetch, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber
 from django.utils.timezone import now
 from django.utils.html import strip_tags
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django_redis import get_redis_connection
+from apps.users.middleware import LAST_SEEN_PENDING_KEY
 from django.urls import reverse
 User = get_user_model()
 
@@ -38,13 +44,62 @@ def send_email(subject, message, recipient, content_type="text/plain"):
     # Send the email
     email.send()
 
+@shared_task
+def send_otp(user_id, email, purpose):
+    """
+    Task to generate an OTP and email it outside the request.
+    Args:
+        user_id (int): ID of the user the OTP belongs to.
+        email (str): Email address to send the OTP to.
+        purpose (str): Purpose of the OTP (e.g., REGISTRATION, EMAIL_CHANGE).
+    """
+    # apps.users.utils imports this module through the mail service, so import it lazily
+    from apps.users.utils import OTPHandler
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    OTPHandler(user, email, purpose).send_otp()
+
+@shared_task
+def send_real_time_notifications_bulk(user_ids, message, notification_type, content_type, object_id):
+    """
+    Task to send the same real-time notification to several users with a single broker publish.
+    Args:
+        user_ids (list): IDs of the users to notify.
+        message (dict): Notification title, body and url.
+        notification_type (str): Category of the notification.
+        content_type (int): ContentType id of the related object.
+        object_id (int): ID of the related object.
+    """
+    # Skip users deleted since the task was queued
+    send_real_time_notifications(
+        list(User.objects.filter(id__in=user_ids).values_list('id', flat=True)),
+        message=message,
+        notification_type=notification_type,
+        content_type=content_type,
+        object_id=object_id
+    )
+
+@shared_task
+def send_real_time_notification_batch_task(entries):
+    """
+    Task to send a batch of possibly different real-time notifications in one go.
+    Args:
+        entries (list): (user_id, message, notification_type, content_type, object_id) entries.
+    """
+    # Skip users deleted since the task was queued
+    existing_ids = set(User.objects.filter(id__in={entry[0] for entry in entries}).values_list('id', flat=True))
+    send_real_time_notification_batch([tuple(entry) for entry in entries if entry[0] in existing_ids])
+
 @shared_task
 def retry_failed_notifications(notification_id):
     """
     Retry sending a failed notification.
     """
     try:
-        notification = Notification.objects.get(id=notification_id, status="failed" or "pending")
+        notification = Notification.objects.select_related('recipient').get(
+            id=notification_id, status__in=("failed", "pending")
+        )
         notification.resend_notification()
     except Notification.DoesNotExist:
         pass
@@ -55,86 +110,143 @@ def prune_notifications():
     Keep only the latest 50 notifications per user and delete the rest.
     Create a interval task on admin panel to run this task every 7 days.
     """
-    users = Notification.objects.values_list('user_id', flat=True).distinct()  # Get all unique user IDs
-    for user_id in users:
-        notifications = Notification.objects.filter(user_id=user_id).order_by('-created_at')
-        if notifications.count() > 50:  # Check if the user has more than 50 notifications
-            # Delete notifications older than the 50th most recent
-            notifications_to_delete = notifications[50:]
-            notifications_to_delete.delete()
-            
+    # Only users over the limit need ranking; the GROUP BY runs off the recipient index
+    over_limit = Notification.objects.values('recipient_id').annotate(
+        count=Count('id')
+    ).filter(count__gt=50).values('recipient_id')
+    # Rank each user's notifications newest first and delete everything past the 50th in one statement
+    ranked = Notification.objects.filter(recipient_id__in=over_limit).annotate(
+        row_number=Window(RowNumber(), partition_by=F('recipient_id'), order_by=F('created_at').desc())
+    ).filter(row_number__gt=50).values('id')
+    deleted_count, _ = Notification.objects.filter(id__in=ranked).delete()
+    project_logger.log(INFO, f"Pruned {deleted_count} old notifications")
+
+@shared_task
+def cleanup_expired_otps():
+    """
+    Delete expired OTP records so the table only holds live verifications.
+    """
+    deleted_count = OTPVerification.cleanup_expired_otps()
+    project_logger.log(INFO, f"Deleted {deleted_count} expired OTP records")
+
+def refresh_membership_task_counts(memberships):
+    """
+    Recomputes total and completed task counts for the given memberships
+    in a single UPDATE with correlated subqueries over task assignments.
+    """
+    assignments = TaskAssignment.objects.filter(
+        task__project_id=OuterRef('project_id'), user_id=OuterRef('user_id')
+    ).values('user_id')
+    memberships.update(
+        total_tasks=Coalesce(Subquery(
+            assignments.annotate(count=Count('task_id')).values('count')
+        ), 0),
+        completed_tasks=Coalesce(Subquery(
+            assignments.filter(task__status='completed').annotate(count=Count('task_id')).values('count')
+        ), 0),
+    )
+
+@shared_task
+def recompute_project_task_counts(project_id):
+    """
+    Recompute a project's total task count and its memberships' task counts.
+    Scheduled once per project per transaction by core.signals.
+    """
+    Project.objects.filter(pk=project_id).update(
+        total_tasks=Task.objects.filter(project_id=project_id).count()
+    )
+    refresh_membership_task_counts(ProjectMembership.objects.filter(project_id=project_id))
+
 @shared_task
 def check_overdue_items():
     current_time = now()
     base_url = settings.FRONTEND_URL
+    # Resolved once instead of per notification
+    task_content_type_id = get_content_type_id(Task)
+    project_content_type_id = get_content_type_id(Project)
+    # Every due-soon notification of this run is saved and pushed as one batch
+    entries = []
 
     # Check tasks nearing overdue
     tasks_to_notify = Task.objects.filter(
         due_date__isnull = False,
         due_date__lte=current_time + timedelta(hours=24),
         status__in=["not_started", "in_progress"]
-    ).prefetch_related('assignments__user')
+    ).only('id', 'name', 'due_date').prefetch_related(
+        Prefetch('assignments', queryset=TaskAssignment.objects.only('id', 'task_id', 'user_id'))
+    )
+    # Already-overdue tasks are a subset of the due-soon ones, so they're picked out here
+    # and marked by primary key instead of scanning the table again
+    overdue_task_ids = []
     for task in tasks_to_notify:
-        task_members = task.assignments.all()
-        for assignment in task_members:
-            send_real_time_notification(
-                user=assignment.user,
-                message={
-                    "title": "Task Nearing Due Date",
-                    "body": f"The task '{task.name}' is nearing its due date.",
-                    "url": f"{base_url}{reverse('task-retrieve-update-destroy', kwargs={'pk': task.id})}"
-                },
-                notification_type="task",
-                content_type=ContentType.objects.get_for_model(Task).id,
-                object_id=task.id
-            )
-
-    # Mark overdue tasks
-    Task.objects.filter(
-        due_date__isnull = False,
-        due_date__lt=current_time,
-        status__in=["not_started", "in_progress"]
-    ).update(status="overdue")
+        if task.due_date < current_time:
+            overdue_task_ids.append(task.id)
+        message = {
+            "title": "Task Nearing Due Date",
+            "body": f"The task '{task.name}' is nearing its due date.",
+            "url": f"{base_url}{reverse('task-retrieve-update-destroy', kwargs={'pk': task.id})}"
+        }
+        entries.extend(
+            (assignment.user_id, message, "task", task_content_type_id, task.id)
+            for assignment in task.assignments.all()
+        )
+
+    # Mark overdue tasks, re-checking the status in case one was completed since it was read
+    if overdue_task_ids:
+        Task.objects.filter(
+            id__in=overdue_task_ids,
+            status__in=["not_started", "in_progress"]
+        ).update(status="overdue")
 
     # Check projects nearing overdue
     projects_to_notify = Project.objects.filter(
         due_date__isnull = False,
         due_date__lte=current_time + timedelta(hours=24),
         status__in=["not_started", "in_progress"]
-    ).prefetch_related('memberships__user')
-    
+    ).only('id', 'name', 'due_date').prefetch_related(
+        Prefetch('memberships', queryset=ProjectMembership.objects.only('id', 'project_id', 'user_id'))
+    )
+
+    overdue_project_ids = []
     for project in projects_to_notify:
-        project_members = project.memberships.all()
-        for membership in project_members:
-            send_real_time_notification(
-                user=membership.user,
-                message={
-                    "title": "Project Nearing Due Date",
-                    "body": f"The project '{project.name}' is nearing its due date.",
-                    "url": f"{base_url}{reverse('project-retrieve-update-destroy', kwargs={'pk': project.id})}"
-                },
-                notification_type="project",
-                content_type=ContentType.objects.get_for_model(Project).id,
-                object_id=project.id
-            )
+        if project.due_date < current_time:
+            overdue_project_ids.append(project.id)
+        message = {
+            "title": "Project Nearing Due Date",
+            "body": f"The project '{project.name}' is nearing its due date.",
+            "url": f"{base_url}{reverse('project-retrieve-update-destroy', kwargs={'pk': project.id})}"
+        }
+        entries.extend(
+            (membership.user_id, message, "project", project_content_type_id, project.id)
+            for membership in project.memberships.all()
+        )
+
+    if entries:
+        send_real_time_notification_batch(entries)
 
     # Mark overdue projects
-    Project.objects.filter(
-        due_date__isnull = False,
-        due_date__lt=current_time,
-        status__in=["not_started", "in_progress"]
-    ).update(status="overdue")
+    if overdue_project_ids:
+        Project.objects.filter(
+            id__in=overdue_project_ids,
+            status__in=["not_started", "in_progress"]
+        ).update(status="overdue")
     
 @shared_task
 def update_last_seen():
-    updated_count = 0
-    for user in User.objects.all():
-        cache_key = f'user_last_seen_{user.id}'
-        last_seen = cache.get(cache_key)
-        if last_seen:
-            user.last_seen = last_seen
-            user.save(update_fields=['last_seen'])
-            cache.delete(cache_key)
-            updated_count += 1
+    """
+    Flush last_seen timestamps buffered by LastSeenMiddleware to the database in one bulk UPDATE.
+    """
+    redis = get_redis_connection('default')
+    cutoff = now().timestamp()
+    pending = redis.zrangebyscore(LAST_SEEN_PENDING_KEY, '-inf', cutoff, withscores=True)
+    users = [
+        User(pk=int(user_id), last_seen=datetime.fromtimestamp(seen_at, tz=dt_timezone.utc))
+        for user_id, seen_at in pending
+    ]
+    if users:
+        User.objects.bulk_update(users, fields=['last_seen'], batch_size=1000)
+    # Entries re-added after the cutoff carry a newer score and stay for the next run
+    redis.zremrangebyscore(LAST_SEEN_PENDING_KEY, '-inf', cutoff)
+    updated_count = len(users)
     
     project_logger.log(INFO, f"Updated last_seen for {updated_count} users")
\ No newline at end of file
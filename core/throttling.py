@@ -0,0 +1,17 @@
+from django.core.cache import caches
+from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle, UserRateThrottle
+
+# Rate-limit counters live in their own cache alias, apart from sessions and cached data
+throttle_cache = caches['throttling']
+
+
+class FastUserRateThrottle(UserRateThrottle):
+    cache = throttle_cache
+
+
+class FastAnonRateThrottle(AnonRateThrottle):
+    cache = throttle_cache
+
+
+class FastScopedRateThrottle(ScopedRateThrottle):
+    cache = throttle_cache
@@ -1,7 +1,14 @@
 import secrets
 
-def generate_secret_key():
-    return ''.join(secrets.choice('abcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*(-_=+)') for i in range(50))
+SECRET_KEY_CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*(-_=+)'
+
+def generate_secret_key(length=50):
+    # Read random bytes in bulk instead of one urandom call per character.
+    # Bytes >= 250 are dropped so every character stays equally likely (250 = 5 * 50).
+    chars = []
+    while len(chars) < length:
+        chars.extend(SECRET_KEY_CHARS[b % 50] for b in secrets.token_bytes(length * 2) if b < 250)
+    return ''.join(chars[:length])
 
 
 if __name__ == "__main__":
@@ -9,6 +16,8 @@ if __name__ == "__main__":
     
     env_content = f"""
 SECRET_KEY={secret_key}
+DJANGO_DEBUG=True
+DJANGO_ALLOWED_HOSTS=localhost,127.0.0.1
 REDIS_PASSWORD=your-redis-password
 # Email settings
 EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend
@@ -16,18 +16,28 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Automatically discover tasks from installed apps.
 app.autodiscover_tasks(lambda: settings.INSTALLED_APPS + ['core.tasks'])
 
+# Schedule objects are built once at import instead of inline in the schedule dict
+HOURLY = crontab(minute=0, hour='*')
+HOURLY_AT_HALF_PAST = crontab(minute=30, hour='*')
+EVERY_15_MINUTES = crontab(minute='0,15,30,45')  # A string, since RedBeat stores the raw spec as JSON
+WEEKLY_SUNDAY_MIDNIGHT = crontab(minute=0, hour=0, day_of_week=0)  # Every Sunday at midnight
+
 app.conf.beat_schedule = {
     'check_due_dates_every_hour': {
         'task': 'core.tasks.check_overdue_items',
-        'schedule': crontab(minute=0, hour='*'),
+        'schedule': HOURLY,
     },
     'prune-notifications-every-7-days': {
         'task': 'core.tasks.prune_notifications',
-        'schedule': crontab(minute=0, hour=0, day_of_week=0),  # This will run every Sunday at midnight
+        'schedule': WEEKLY_SUNDAY_MIDNIGHT,
     },
     'update-last-seen': {
         'task': 'core.tasks.update_last_seen',
-        'schedule': crontab(minute='*/15'),  # Run every 15 minutes
+        'schedule': EVERY_15_MINUTES,
+    },
+    'cleanup-expired-otps-every-hour': {
+        'task': 'core.tasks.cleanup_expired_otps',
+        'schedule': HOURLY_AT_HALF_PAST,
     },
 }
 @app.task(bind=True)
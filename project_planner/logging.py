@@ -1,18 +1,51 @@
 import os
+import atexit
+import queue
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+class ProcessQueueHandler(QueueHandler):
+    """
+    Queues records for a background QueueListener so the calling thread never waits on disk.
+    The listener is started lazily in whichever process emits, because a listener thread
+    started before Celery or the dev server forks does not exist in the child processes.
+    """
+    def __init__(self, *handlers):
+        super().__init__(queue.Queue(-1))
+        self.handlers = handlers
+        self.listener = None
+        self.listener_pid = None
+
+    def emit(self, record):
+        # Handler.handle() holds self.lock here, so only one thread starts the listener
+        if self.listener_pid != os.getpid():
+            self.start_listener()
+        super().emit(record)
+
+    def start_listener(self):
+        # Fresh queue per process so a child never drains records queued before the fork
+        self.queue = queue.Queue(-1)
+        self.listener = QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+        self.listener_pid = os.getpid()
+        atexit.register(self.stop_listener)
+
+    def stop_listener(self):
+        # Flush queued records on exit; forked children inherit this hook for a listener they don't run
+        if self.listener is not None and self.listener_pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
 
-def get_logger(name):
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
 
+def _build_queue_handler():
     # File handler
     log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
     os.makedirs(log_dir, exist_ok=True)
     file_handler = RotatingFileHandler(
         os.path.join(log_dir, 'application.log'),
-        maxBytes=5 * 1024 * 1024,  # 5 MB
-        backupCount=5
+        maxBytes=50 * 1024 * 1024,  # 50 MB, in line with settings.LOG_FILE_MAX_SIZE_MB for the health check
+        backupCount=10
     )
     file_handler.setLevel(logging.DEBUG)
 
@@ -25,9 +58,18 @@ def get_logger(name):
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
 
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    return ProcessQueueHandler(file_handler, console_handler)
+
+# One queue handler shared by every logger, feeding the file and console handlers
+queue_handler = _build_queue_handler()
+
+def get_logger(name):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+
+    # Add the queue handler once, however many times the logger is requested
+    if queue_handler not in logger.handlers:
+        logger.addHandler(queue_handler)
 
     return logger
 
@@ -40,4 +82,3 @@ INFO = logging.INFO
 WARNING = logging.WARNING
 ERROR = logging.ERROR
 CRITICAL = logging.CRITICAL
-
@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the busy list endpoints: each page is an index range
+    scan on created_at and no COUNT(*) is issued, unlike page-number pagination.
+    Endpoints that need page numbers or a total count keep the default
+    PageNumberPagination from REST_FRAMEWORK.
+    """
+    ordering = '-created_at'
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
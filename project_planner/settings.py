@@ -1,8 +1,8 @@
 import os
 from datetime import timedelta
 from pathlib import Path
-from re import S
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 # Load environment variables
 load_dotenv()
@@ -14,8 +14,12 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY SETTINGS
 # ================
 SECRET_KEY = os.getenv('SECRET_KEY')
-DEBUG = True
-ALLOWED_HOSTS = []
+if not SECRET_KEY:
+    # Refuse to start rather than run with an empty signing key
+    raise ImproperlyConfigured("SECRET_KEY environment variable is not set")
+# Off unless explicitly enabled: DEBUG keeps every SQL query in memory and serves static files through Django
+DEBUG = os.getenv('DJANGO_DEBUG', 'False').lower() == 'true'
+ALLOWED_HOSTS = [host for host in os.getenv('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',') if host]
 
 # Application definition
 # ====================
@@ -56,6 +60,8 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 # ======================
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Serves collected static files straight from the WSGI/ASGI process when DEBUG is off
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,6 +72,9 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Request paths LastSeenMiddleware ignores entirely: no token decode, no last_seen write
+LAST_SEEN_SKIP_PATH_PREFIXES = ('/static/', '/media/', '/admin/', '/api/v1/schema/')
+
 # URL Configuration
 # ===============
 ROOT_URLCONF = 'project_planner.urls'
@@ -93,12 +102,40 @@ ASGI_APPLICATION = 'project_planner.asgi.application'
 
 # Database Configuration
 # ====================
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+DB_ENGINE = os.getenv('DB_ENGINE', 'django.db.backends.sqlite3')
+if DB_ENGINE == 'django.db.backends.sqlite3':
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': 60,
+            'OPTIONS': {
+                # WAL lets readers run alongside the single writer (web requests, Celery workers, beat)
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA cache_size=-20000;'
+                    'PRAGMA temp_store=MEMORY;'
+                ),
+                # Take the write lock up front so concurrent writers wait instead of failing on upgrade
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME'),
+            'USER': os.getenv('DB_USER'),
+            'PASSWORD': os.getenv('DB_PASSWORD'),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', ''),
+            # Persistent connections, checked before reuse instead of reconnecting per request
+            'CONN_MAX_AGE': 60,
+            'CONN_HEALTH_CHECKS': True,
+        }
     }
-}
 
 # Authentication Configuration
 # =========================
@@ -134,6 +171,15 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    # Compressed, content-hashed copies written by collectstatic so browsers can cache them forever
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
 # Media Files Configuration
 # =======================
@@ -154,12 +200,39 @@ CACHES = {
         "LOCATION": f"redis://127.0.0.1:6379/0",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
-            "CONNECTION_POOL_KWARGS": {"max_connections": 100}
+            # Wait briefly for a free pooled connection instead of failing once all 100 are in use
+            "CONNECTION_POOL_CLASS": "redis.BlockingConnectionPool",
+            "CONNECTION_POOL_KWARGS": {"max_connections": 100, "timeout": 1.0, "socket_keepalive": True},
+            # Fail fast rather than hang requests if Redis stops responding
+            "SOCKET_CONNECT_TIMEOUT": 1,
+            "SOCKET_TIMEOUT": 2,
+            # zstd-compress cached values; entries written before compression are still read as-is
+            "COMPRESSOR": "django_redis.compressors.zstd.ZstdCompressor",
+            # Treat a Redis outage as a cache miss instead of failing the request
+            "IGNORE_EXCEPTIONS": True,
         },
         'KEY_PREFIX': 'project_planner',
-    }
+    },
+    # Rate-limit counters on their own Redis DB: tiny uncompressed values, kept out of the main keyspace
+    "throttling": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://127.0.0.1:6379/1",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CONNECTION_POOL_KWARGS": {"max_connections": 50, "socket_keepalive": True},
+            "SOCKET_CONNECT_TIMEOUT": 1,
+            "SOCKET_TIMEOUT": 1,
+            # An unreachable Redis lets requests through rather than rejecting them
+            "IGNORE_EXCEPTIONS": True,
+        },
+        'KEY_PREFIX': 'project_planner',
+    },
 }
 
+DJANGO_REDIS_IGNORE_EXCEPTIONS = True
+DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
+DJANGO_REDIS_LOGGER = 'project_planner'
+
 # Channel Layers Configuration
 # ========================
 CHANNEL_LAYERS = {
@@ -171,8 +244,11 @@ CHANNEL_LAYERS = {
     },
 }
 
-SESSION_ENGINE = "django.contrib.sessions.backends.cache"
-SESSION_CACHE_ALIAS = "default"
+# Sessions only back the Django admin and browsable API; keeping them in a signed cookie means
+# SessionAuthentication never costs a Redis round-trip on JWT or anonymous API requests
+SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+SESSION_COOKIE_HTTPONLY = True
+SESSION_COOKIE_SECURE = not DEBUG
 
 # REST Framework Configuration
 # =========================
@@ -180,21 +256,25 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated', 
     ],
+    # JWT only: API clients never use sessions, and SessionAuthentication would load the
+    # session and enforce CSRF on every request that arrives without a bearer token
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.SessionAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.UserRateThrottle',
-        'rest_framework.throttling.AnonRateThrottle',
+        'core.throttling.FastUserRateThrottle',
+        'core.throttling.FastAnonRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'user': '1000/day',
         'anon': '100/hour',
+        'otp': '5/min',
+        'login': '10/min',
+        'otp_send': '3/min',
     },
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
@@ -207,6 +287,9 @@ REST_FRAMEWORK = {
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.serializers.CachedBlacklistTokenRefreshSerializer',
+    # The login view records last_login itself with a single UPDATE; don't save the user on token obtain too
+    'UPDATE_LAST_LOGIN': False,
 }
 
 # API Documentation Configuration
@@ -233,24 +316,53 @@ SPECTACULAR_SETTINGS = {
 
 # Email Configuration
 # =================
-EMAIL_BACKEND = os.getenv('EMAIL_BACKEND')
+# Defaults match a standard SMTP relay with STARTTLS, so a missing EMAIL_PORT no longer breaks startup
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = os.getenv('EMAIL_HOST')
-EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS') == 'True'
-EMAIL_PORT = int(os.getenv('EMAIL_PORT'))
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', '587'))
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
-DEFAULT_FROM_EMAIL = os.getenv('EMAIL_HOST_USER')
+DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
 # Celery Configuration
 # ==================
 # if not using redis password then url = 'redis://localhost:6379/0'
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
-CELERY_ACCEPT_CONTENT = ['json']
-CELERY_TASK_SERIALIZER = 'json'
-CELERY_RESULT_SERIALIZER = 'json'
+# msgpack is smaller and faster to encode than JSON; json stays accepted for messages queued before the switch
+CELERY_ACCEPT_CONTENT = ['msgpack', 'json']
+CELERY_TASK_SERIALIZER = 'msgpack'
+CELERY_RESULT_SERIALIZER = 'msgpack'
 CELERY_TIMEZONE = 'Asia/Dhaka'
 CELERY_TASK_RESULT_EXPIRES = 3600
+# Reuse long-lived, keepalive broker and result connections instead of reconnecting per operation
+CELERY_BROKER_POOL_LIMIT = 50
+CELERY_BROKER_TRANSPORT_OPTIONS = {'socket_keepalive': True, 'health_check_interval': 30, 'retry_on_timeout': True}
+CELERY_REDIS_MAX_CONNECTIONS = 100
+CELERY_RESULT_BACKEND_TRANSPORT_OPTIONS = {'socket_keepalive': True}
+# Keep beat's schedule state in Redis rather than a local shelve file; app.conf.beat_schedule is still loaded
+CELERY_BEAT_SCHEDULER = 'redbeat.RedBeatScheduler'
+CELERY_REDBEAT_REDIS_URL = CELERY_BROKER_URL
+CELERY_REDBEAT_LOCK_TIMEOUT = 90
+# Tasks are DB/Redis-bound, so a small prefetch keeps long tasks from hoarding queued messages
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(os.getenv('CELERY_WORKER_PREFETCH_MULTIPLIER', '2'))
+# Acknowledge after the task runs so work held by a worker that dies is redelivered
+CELERY_TASK_ACKS_LATE = os.getenv('CELERY_TASK_ACKS_LATE', 'True') == 'True'
+# Recycle prefork children after many tasks to cap memory growth; the fork itself is cheap because
+# the parent has already imported Django and the task modules
+CELERY_WORKER_MAX_TASKS_PER_CHILD = int(os.getenv('CELERY_WORKER_MAX_TASKS_PER_CHILD', '1000'))
+# Beat jobs get their own queues so the hourly overdue scan and the weekly prune can't hold up
+# the quick bookkeeping jobs or user-facing email/notification tasks on 'default'
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'core.tasks.check_overdue_items': {'queue': 'periodic'},
+    'core.tasks.prune_notifications': {'queue': 'maintenance'},
+    'core.tasks.update_last_seen': {'queue': 'fast'},
+    'core.tasks.cleanup_expired_otps': {'queue': 'fast'},
+}
+# No task sets a rate_limit, so skip the per-task token bucket bookkeeping
+CELERY_WORKER_DISABLE_RATE_LIMITS = True
 
 # Stripe Configuration
 # ====================
@@ -273,5 +385,5 @@ NETWORK_LATENCY_THRESHOLD_MS = 500
 QUEUE_TASK_THRESHOLD = 100
 
 # Logging configuration
-from project_planner.logging import get_logger
-project_logger = get_logger('project_planner')
\ No newline at end of file
+# Importing the module configures the project logger once; get_logger is idempotent
+from project_planner.logging import project_logger